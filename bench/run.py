@@ -0,0 +1,185 @@
+"""Reproducible benchmarks for the launcher's hot paths against bench/stub.py.
+
+    python bench/run.py [--latency 30] [--rate-limit 100] [--mods 200] [--out results.json]
+    python bench/run.py --compare before.json after.json
+
+Each run gets a scratch Minecraft directory (via CESENA_MINECRAFT_DIR) and points
+the Modrinth and manifest URLs at a local stub, so results only depend on the
+code and the options given. The JSON report carries timings, request counts per
+endpoint and the client-side net stats for every scenario.
+"""
+from pathlib import Path
+import os, sys, json, time, shutil, argparse, platform, tempfile, subprocess, contextlib
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT / 'bench'))
+
+import stub
+
+MC_VERSION, SWITCH_VERSION, LOADER = "1.21", "1.20.4", "fabric"
+SEARCH_BURST = ["s", "so", "sod", "sodi", "sodiu", "sodium", "l", "li", "lit", "lith", "lithium"]
+
+def git_commit():
+    try: return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip() or None
+    except OSError: return None
+
+@contextlib.contextmanager
+def quiet():
+    # The launcher logs with print(); keep the report readable.
+    with open(os.devnull, "w") as null, contextlib.redirect_stdout(null):
+        yield
+
+class Bench:
+    def __init__(self, server: stub.StubServer, mc_dir: Path):
+        self.server = server
+        self.mc_dir = mc_dir
+        self.results = {}
+
+    def forget(self):
+        # Drop everything the launcher caches on disk and in memory.
+        import utils, http_cache, mod_cache
+        config = utils.get_config_dir()
+        for name in ("http_cache", "mods_cache", "locks", "profiles"):
+            shutil.rmtree(config / name, ignore_errors=True)
+        # mods is a symlink into profiles/ once profiles are on; rmtree refuses to follow one.
+        mods = self.mc_dir / "mods"
+        if mods.is_symlink(): mods.unlink()
+        else: shutil.rmtree(mods, ignore_errors=True)
+        http_cache._total = None
+        mod_cache._verified.clear()
+        utils.get_online_versions.cache_clear()
+
+    def measure(self, name, fn, **extra):
+        import net
+        self.server.reset()
+        net.reset_stats()
+        start = time.perf_counter()
+        with quiet(): value = fn()
+        seconds = time.perf_counter() - start
+        self.results[name] = {
+            "seconds":      round(seconds, 4),
+            "requests":     dict(self.server.calls),
+            "rate_limited": self.server.limited,
+            "net":          net.stats(),
+            **extra,
+        }
+        print(f"  {name:<22} {seconds * 1000:>9.1f} ms  {sum(self.server.calls.values()):>5} requests")
+        return value
+
+    def set_mods(self, count):
+        import utils
+        mods = [p for p in self.server.catalog.projects.values() if not p["id"].startswith("lib")][:count]
+        utils.save_mods_config({"enabled_mods": [{"project_id": p["id"], "title": p["title"], "description": p["description"], "icon_url": p["icon_url"], "downloads": p["downloads"]} for p in mods]})
+
+    def resolve(self, mods):
+        import mod_loader
+        self.set_mods(mods)
+        self.forget()
+        report = self.measure("resolve_cold", lambda: mod_loader.prepare_mods(MC_VERSION, LOADER), mods=mods)
+        self.results["resolve_cold"]["synced"] = len(report.added)
+        self.measure("resolve_warm", lambda: mod_loader.prepare_mods(MC_VERSION, LOADER), mods=mods)
+
+    def version_switch(self):
+        import mod_loader
+        self.measure("switch_to_other", lambda: mod_loader.prepare_mods(SWITCH_VERSION, LOADER))
+        self.measure("switch_back", lambda: mod_loader.prepare_mods(MC_VERSION, LOADER))
+
+    def search_burst(self):
+        import modrinth
+        self.forget()
+        self.measure("search_burst_cold", lambda: [modrinth.search_mods(q) for q in SEARCH_BURST], queries=len(SEARCH_BURST))
+        self.measure("search_burst_warm", lambda: [modrinth.search_mods(q) for q in SEARCH_BURST], queries=len(SEARCH_BURST))
+
+    def version_list(self, count):
+        import utils
+        versions = self.mc_dir / "versions"
+        for i in range(count):
+            name = f"fabric-loader-0.16.{i}-{MC_VERSION}" if i % 2 else f"1.{i // 10}.{i % 10}"
+            d = versions / name
+            d.mkdir(parents=True, exist_ok=True)
+            (d / f"{name}.json").write_text(json.dumps({"id": name, "inheritsFrom": MC_VERSION if i % 2 else None}))
+        (utils.get_config_dir() / "versions_index.json").unlink(missing_ok=True)
+        utils.get_version_index.cache_clear()
+
+        self.measure("local_versions_cold", utils.get_local_versions, versions=count)
+        self.measure("local_versions_warm", utils.get_local_versions, versions=count)
+        self.measure("format_versions", lambda: [utils.format_vid(v.name) for v in utils.get_local_versions()], versions=count)
+        self.measure("online_versions", utils.get_online_versions)
+
+SCENARIOS = ("resolve", "switch", "search", "versions")
+
+def run(args):
+    server = stub.StubServer(latency_ms=args.latency, rate_limit=args.rate_limit)
+    if args.fixtures: server.catalog = stub.Catalog.load(args.fixtures, base_url=server.url)
+    server.start()
+
+    mc_dir = Path(tempfile.mkdtemp(prefix="cesena-bench-"))
+    os.environ["CESENA_MINECRAFT_DIR"] = str(mc_dir)
+    os.environ["CESENA_MODRINTH_API"] = server.url + "/v2"
+    os.environ["CESENA_MANIFEST_URL"] = server.url + "/mc/game/version_manifest.json"
+
+    bench = Bench(server, mc_dir)
+    scenarios = args.scenario or SCENARIOS
+    print(f"Stub on {server.url}, latency {args.latency} ms, rate limit {args.rate_limit or 'none'}; scratch dir {mc_dir}")
+    try:
+        if "resolve" in scenarios: bench.resolve(args.mods)
+        if "switch" in scenarios:
+            if "resolve" not in scenarios:
+                bench.set_mods(args.mods)
+                with quiet(): __import__("mod_loader").prepare_mods(MC_VERSION, LOADER)
+            bench.version_switch()
+        if "search" in scenarios: bench.search_burst()
+        if "versions" in scenarios: bench.version_list(args.versions)
+    finally:
+        server.stop()
+        if not args.keep: shutil.rmtree(mc_dir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "commit":      git_commit(),
+            "python":      platform.python_version(),
+            "platform":    platform.platform(),
+            "date":        time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "latency_ms":  args.latency,
+            "rate_limit":  args.rate_limit,
+            "mods":        args.mods,
+            "versions":    args.versions,
+        },
+        "scenarios": bench.results,
+    }
+
+def compare(before_path, after_path):
+    before = json.loads(Path(before_path).read_text())
+    after = json.loads(Path(after_path).read_text())
+    print(f"{'scenario':<22} {before['meta'].get('commit') or 'before':>10} {after['meta'].get('commit') or 'after':>10}   change")
+    for name, res in after["scenarios"].items():
+        old = before["scenarios"].get(name)
+        if not old:
+            print(f"{name:<22} {'-':>10} {res['seconds']:>10.4f}")
+            continue
+        change = (res["seconds"] - old["seconds"]) / old["seconds"] * 100 if old["seconds"] else 0
+        print(f"{name:<22} {old['seconds']:>10.4f} {res['seconds']:>10.4f}   {change:+.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=20, help="stub latency per request, ms")
+    parser.add_argument("--rate-limit", type=float, default=None, help="stub requests per second before 429s")
+    parser.add_argument("--mods", type=int, default=200)
+    parser.add_argument("--versions", type=int, default=500)
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="run only these (repeatable)")
+    parser.add_argument("--fixtures", help="catalog JSON for the stub instead of the generated one")
+    parser.add_argument("--out", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch Minecraft directory")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two reports and exit")
+    args = parser.parse_args()
+
+    if args.compare: return compare(*args.compare)
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.out: Path(args.out).write_text(text)
+    else: print(text)
+
+if __name__ == "__main__":
+    main()
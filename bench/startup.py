@@ -0,0 +1,98 @@
+"""Startup budget check for the launcher window.
+
+Runs each measurement in a fresh interpreter so nothing is already imported:
+
+    python bench/startup.py [--runs 5] [--json]
+
+Reports per-module import cost and, for a full offscreen start, the time to the
+window's first paint, to the managers being built, and to the instance list
+being populated. Exits non-zero if a median exceeds its budget.
+"""
+from pathlib import Path
+import os, sys, json, time, shutil, argparse, tempfile, statistics, subprocess
+
+SRC = Path(__file__).resolve().parent.parent / 'src'
+
+BUDGET_MS = {
+    "import_main":  150,
+    "first_paint":  400,
+    "ready":        1500,
+}
+
+MODULES = ["utils", "main", "instances", "auth", "mods", "requests", "minecraft_launcher_lib"]
+
+CHILD = r"""
+import time
+t0 = time.perf_counter()
+import sys, json
+import main
+t_import = time.perf_counter()
+
+from PySide6.QtWidgets import QApplication
+app = QApplication(sys.argv)
+times = {"import_main": (t_import - t0) * 1000}
+def mark(name):
+    times[name] = (time.perf_counter() - t0) * 1000
+
+window = main.Cesena()
+window.first_paint.connect(lambda: mark("first_paint"))
+def on_ready():
+    mark("ready")
+    window.ITEMS[0]['inst'].loaded.connect(lambda: (mark("instances_loaded"), app.quit()))
+window.ready.connect(on_ready)
+window.show()
+
+from PySide6.QtCore import QTimer
+QTimer.singleShot(30000, app.quit)
+app.exec()
+print(json.dumps(times))
+"""
+
+def run_child(code):
+    # Each child gets an empty scratch Minecraft directory rather than the developer's real one.
+    mc_dir = tempfile.mkdtemp(prefix="cesena-startup-")
+    env = {**os.environ, "QT_QPA_PLATFORM": os.environ.get("QT_QPA_PLATFORM", "offscreen"), "CESENA_MINECRAFT_DIR": mc_dir}
+    try:
+        out = subprocess.run([sys.executable, "-c", code], cwd=SRC, env=env, capture_output=True, text=True, check=True)
+    finally:
+        shutil.rmtree(mc_dir, ignore_errors=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def import_cost(module):
+    code = f"import time, json\nt = time.perf_counter()\nimport {module}\nprint(json.dumps((time.perf_counter() - t) * 1000))"
+    return run_child(code)
+
+def median(values):
+    return round(statistics.median(values), 1) if values else None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    imports = {m: median([import_cost(m) for _ in range(args.runs)]) for m in MODULES}
+
+    runs = [run_child(CHILD) for _ in range(args.runs)]
+    startup = {k: median([r[k] for r in runs if k in r]) for k in ("import_main", "first_paint", "ready", "instances_loaded")}
+
+    # A milestone no run reached (the window never became ready, say) fails the check too.
+    over = {k: (startup[k], budget) for k, budget in BUDGET_MS.items() if startup.get(k) is None or startup[k] > budget}
+    missing = [k for k, t in startup.items() if t is None]
+    report = {"runs": args.runs, "imports_ms": imports, "startup_ms": startup, "budget_ms": BUDGET_MS, "over_budget": list(over), "missing": missing}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print("Import cost (median ms, fresh interpreter):")
+        for m, t in imports.items(): print(f"  {m:<24} {t if t is not None else 'missing':>8}")
+        print("Startup (median ms since interpreter start):")
+        for k, t in startup.items():
+            budget = BUDGET_MS.get(k)
+            flag = "" if budget is None else (" OVER" if k in over else " ok") + f" (budget {budget})"
+            print(f"  {k:<24} {t if t is not None else 'missing':>8}{flag}")
+
+    return 1 if over or missing else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
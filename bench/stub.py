@@ -0,0 +1,286 @@
+"""Local stand-in for the Modrinth API, Mojang's version manifest and the jar CDN.
+
+The catalog is generated deterministically from a seed, or loaded from a
+fixtures file holding {"projects": [...], "versions": [...], "manifest": {...}}
+in the same shape the real APIs return (see Catalog.save). Every response can
+be delayed by a fixed latency, and a token bucket answers 429 with Retry-After
+once the configured request rate is exceeded. Jars honour Range requests, and
+with etags=True JSON responses carry an ETag and answer a matching
+If-None-Match with 304.
+
+    python bench/stub.py --port 8765 --latency 40 --rate-limit 50
+"""
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import re, json, time, random, hashlib, argparse, threading
+
+GAME_VERSIONS = ["1.20.1", "1.20.4", "1.21"]
+LOADERS = ["fabric", "quilt", "forge"]
+
+def payload(version_id: str, size: int):
+    seed = hashlib.sha256(version_id.encode()).digest()
+    return (seed * (size // len(seed) + 1))[:size]
+
+class Catalog:
+    def __init__(self, projects=(), versions=(), manifest=None, jar_size=32 * 1024):
+        self.projects = {p["id"]: p for p in projects}
+        self.slugs = {p["slug"]: p for p in projects if p.get("slug")}
+        self.versions = {v["id"]: v for v in versions}
+        self.by_hash = {}
+        self.jars = {}
+        self.jar_size = jar_size
+        self.manifest = manifest or {"latest": {}, "versions": []}
+        for v in self.versions.values():
+            for f in v["files"]:
+                self.by_hash[f["hashes"]["sha1"]] = v
+                self.jars[f["hashes"]["sha1"]] = v["id"]
+
+    @classmethod
+    def generate(cls, projects=300, versions_per_project=12, libraries=10, mc_versions=500, seed=1, jar_size=32 * 1024, base_url=""):
+        rng = random.Random(seed)
+        libs = [f"lib{i:03d}" for i in range(libraries)]
+        ids = libs + [f"mod{i:04d}" for i in range(projects)]
+        out_projects, out_versions = [], []
+
+        for n, pid in enumerate(ids):
+            loaders = rng.sample(LOADERS, rng.randint(1, 2)) if pid not in libs else list(LOADERS)
+            if "fabric" not in loaders and rng.random() < 0.8: loaders.append("fabric")
+            deps = [] if pid in libs else rng.sample(libs, rng.choice((0, 0, 1, 2)))
+
+            vids, gvs = [], set()
+            for i in range(versions_per_project):
+                vid = f"{pid}v{i:02d}"
+                game_versions = [GAME_VERSIONS[min(i * len(GAME_VERSIONS) // versions_per_project, len(GAME_VERSIONS) - 1)]]
+                gvs.update(game_versions)
+                data = payload(vid, jar_size)
+                sha1 = hashlib.sha1(data).hexdigest()
+                out_versions.append({
+                    "id": vid,
+                    "project_id": pid,
+                    "loaders": loaders,
+                    "game_versions": game_versions,
+                    "date_published": f"2024-{1 + i // 28:02d}-{1 + i % 28:02d}T00:00:00Z",
+                    "dependencies": [{"project_id": d, "version_id": None, "dependency_type": "required"} for d in deps],
+                    "files": [{
+                        "primary": True,
+                        "filename": f"{pid}-{i}.jar",
+                        "url": f"{base_url}/jar/{sha1}",
+                        "size": jar_size,
+                        "hashes": {"sha1": sha1, "sha512": hashlib.sha512(data).hexdigest()},
+                    }],
+                })
+                vids.append(vid)
+
+            out_projects.append({
+                "id": pid,
+                "slug": f"{pid}-slug",
+                "title": f"{'Library' if pid in libs else 'Mod'} {rng.choice(['Sodium', 'Lithium', 'Iris', 'Create', 'Journey', 'Storage', 'Tweaks'])} {n}",
+                "description": f"Synthetic project {pid}",
+                "icon_url": None,
+                "downloads": rng.randint(100, 10_000_000),
+                "categories": rng.sample(["optimization", "utility", "decoration", "magic", "technology"], 2),
+                "loaders": loaders,
+                "game_versions": sorted(gvs),
+                "versions": vids,
+            })
+
+        manifest = {
+            "latest": {"release": "1.21", "snapshot": "1.21"},
+            "versions": [
+                {"id": f"1.{i // 10}.{i % 10}", "type": "release", "url": f"{base_url}/mc/v/{i}.json", "releaseTime": f"2020-01-01T00:00:{i % 60:02d}+00:00"}
+                for i in range(mc_versions)
+            ],
+        }
+        return cls(out_projects, out_versions, manifest, jar_size)
+
+    @classmethod
+    def load(cls, path, base_url=""):
+        data = json.loads(open(path).read())
+        catalog = cls(data["projects"], data["versions"], data.get("manifest"))
+        if base_url: catalog.rebase(base_url)
+        return catalog
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({"projects": list(self.projects.values()), "versions": list(self.versions.values()), "manifest": self.manifest}, f)
+
+    def rebase(self, base_url):
+        # Point jar URLs at this server; recorded fixtures carry the real CDN URLs.
+        for v in self.versions.values():
+            for f in v["files"]:
+                f["url"] = f"{base_url}/jar/{f['hashes']['sha1']}"
+
+    def project(self, pid):
+        return self.projects.get(pid) or self.slugs.get(pid)
+
+    def matching(self, pid, loaders, game_versions):
+        p = self.project(pid)
+        if not p: return []
+        # Newest first, as the real endpoint answers, whatever order the project lists them in.
+        vs = sorted((self.versions[v] for v in p["versions"]), key=lambda v: v["date_published"], reverse=True)
+        return [v for v in vs if set(loaders) & set(v["loaders"]) and set(game_versions) & set(v["game_versions"])]
+
+    def search(self, query, offset=0, limit=10):
+        q = query.lower()
+        hits = sorted((p for p in self.projects.values() if q in p["title"].lower() or q in p["id"]), key=lambda p: -p["downloads"])
+        return {
+            "hits": [{"project_id": p["id"], "slug": p["slug"], "title": p["title"], "description": p["description"],
+                      "icon_url": p["icon_url"], "downloads": p["downloads"], "categories": p["categories"] + p["loaders"],
+                      "versions": p["game_versions"]} for p in hits[offset:offset + limit]],
+            "offset": offset, "limit": limit, "total_hits": len(hits),
+        }
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = rate
+        self.capacity = burst or rate
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens < 1: return False
+            self.tokens -= 1
+            return True
+
+class StubServer:
+    def __init__(self, catalog: Catalog = None, latency_ms: float = 0, rate_limit: float = None, host="127.0.0.1", port=0, etags=False):
+        self.catalog = catalog
+        self.latency = latency_ms / 1000
+        self.bucket = TokenBucket(rate_limit) if rate_limit else None
+        self.etags = etags
+        self.calls = Counter()
+        self.not_modified = 0
+        self.ranges = []
+        self.limited = 0
+        self.httpd = ThreadingHTTPServer((host, port), self.handler())
+        self.httpd.daemon_threads = True
+        self.url = f"http://{host}:{self.httpd.server_port}"
+        if self.catalog is None: self.catalog = Catalog.generate(base_url=self.url)
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset(self):
+        self.calls.clear()
+        self.not_modified = 0
+        self.ranges.clear()
+        self.limited = 0
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args): pass
+
+            def send(self, obj=None, raw=None, status=200, headers=()):
+                body = raw if raw is not None else json.dumps(obj).encode()
+                if raw is None and status == 200 and stub.etags:
+                    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                    headers = [*headers, ("ETag", etag)]
+                    if self.headers.get("If-None-Match") == etag:
+                        stub.not_modified += 1
+                        self.send_response(304)
+                        self.send_header("ETag", etag)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json" if raw is None else "application/java-archive")
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in headers: self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def admit(self, path):
+                stub.calls[path] += 1
+                if stub.latency: time.sleep(stub.latency)
+                if stub.bucket and not stub.bucket.take():
+                    stub.limited += 1
+                    self.send({"error": "ratelimited"}, status=429, headers=[("Retry-After", "1")])
+                    return False
+                return True
+
+            def do_GET(self):
+                u = urlparse(self.path)
+                q = {k: v[0] for k, v in parse_qs(u.query).items()}
+                path = u.path
+                route = "/v2/project/{id}/version" if path.startswith("/v2/project/") else ("/jar" if path.startswith("/jar/") else path)
+                if not self.admit(route): return
+
+                c = stub.catalog
+                if path == "/v2/search":
+                    self.send(c.search(q.get("query", ""), int(q.get("offset", 0)), int(q.get("limit", 10))))
+                elif path == "/v2/projects":
+                    self.send([p for p in map(c.project, json.loads(q["ids"])) if p])
+                elif path == "/v2/versions":
+                    self.send([c.versions[i] for i in json.loads(q["ids"]) if i in c.versions])
+                elif route == "/v2/project/{id}/version":
+                    pid = path.split("/")[3]
+                    if not c.project(pid): return self.send({"error": "not_found"}, status=404)
+                    self.send(c.matching(pid, json.loads(q.get("loaders", "[]")), json.loads(q.get("game_versions", "[]"))))
+                elif route == "/jar":
+                    vid = c.jars.get(path[5:])
+                    if not vid: return self.send({"error": "not_found"}, status=404)
+                    self.send_jar(payload(vid, c.jar_size))
+                elif path.endswith("version_manifest.json"):
+                    self.send(c.manifest)
+                else:
+                    self.send({"error": "not_found"}, status=404)
+
+            def send_jar(self, data):
+                m = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range", ""))
+                if not m: return self.send(raw=data)
+                start = int(m.group(1))
+                stub.ranges.append(start)
+                if start >= len(data):
+                    return self.send(raw=b"", status=416, headers=[("Content-Range", f"bytes */{len(data)}")])
+                self.send(raw=data[start:], status=206, headers=[("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")])
+
+            def do_POST(self):
+                u = urlparse(self.path)
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not self.admit(u.path): return
+
+                c = stub.catalog
+                if u.path == "/v2/version_files/update":
+                    out = {}
+                    for h in body.get("hashes", []):
+                        v = c.by_hash.get(h)
+                        if not v: continue
+                        candidates = c.matching(v["project_id"], body.get("loaders", []), body.get("game_versions", []))
+                        if candidates: out[h] = max(candidates, key=lambda v: v["date_published"])
+                    self.send(out)
+                else:
+                    self.send({"error": "not_found"}, status=404)
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0, help="added latency per request, ms")
+    parser.add_argument("--rate-limit", type=float, default=None, help="requests per second before answering 429")
+    parser.add_argument("--fixtures", help="catalog JSON to serve instead of the generated one")
+    args = parser.parse_args()
+
+    server = StubServer(latency_ms=args.latency, rate_limit=args.rate_limit, port=args.port)
+    if args.fixtures: server.catalog = Catalog.load(args.fixtures, base_url=server.url)
+    print(f"Serving on {server.url} (CESENA_MODRINTH_API={server.url}/v2, CESENA_MANIFEST_URL={server.url}/mc/game/version_manifest.json)")
+    try: server.httpd.serve_forever()
+    except KeyboardInterrupt: pass
+
+if __name__ == "__main__":
+    main()
@@ -79,15 +79,8 @@ class AuthManager(QWidget):
             )
 
     def save_accounts(self):
-        self.accounts = []
-        
-        for i in range(self.scrolla.count()):
-            item = self.scrolla.item(i)
-            widget = self.scrolla.itemWidget(item)
-            
-            name = widget.username
-            self.accounts.append(Account(name))
-            
+        self.accounts = [Account(name) for name in self.scrolla.get_order()]
+
         self.save()
 
     def save(self):
@@ -113,7 +106,14 @@ class AuthManager(QWidget):
 
         self.username_input.clear()
         self.save()
-        self.update_accounts()
+
+        self.info_label.setText("")
+        self.scrolla.addCard(
+            uid=name,
+            text=name,
+            is_selected=(name == self.current_account),
+            show_delete=True,
+        )
 
     def handle_reorder(self, new_order_ids):
         self.accounts = [Account(uid) for uid in new_order_ids]
@@ -122,7 +122,7 @@ class AuthManager(QWidget):
     def handle_select(self, username):
         self.current_account = username
         self.save()
-        self.update_accounts()
+        self.scrolla.setSelected(username)
 
     def handle_delete(self, username):
         self.accounts = [a for a in self.accounts if a.username != username]
@@ -131,4 +131,6 @@ class AuthManager(QWidget):
             self.current_account = self.accounts[0].username if self.accounts else None
             
         self.save()
-        self.update_accounts()
\ No newline at end of file
+        self.scrolla.removeCard(username)
+        if self.current_account: self.scrolla.setSelected(self.current_account)
+        if not self.accounts: self.info_label.setText("No accounts found. Consider adding one.")
\ No newline at end of file
@@ -0,0 +1,164 @@
+import json, sqlite3, threading
+
+import utils
+
+# Local index of every mod we've seen (search hits, /projects lookups, enabled
+# mods), so the mod manager can answer a query before Modrinth does and filter
+# the enabled list offline.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mods (
+    project_id   TEXT PRIMARY KEY,
+    slug         TEXT,
+    title        TEXT,
+    description  TEXT,
+    icon_url     TEXT,
+    downloads    INTEGER,
+    categories   TEXT
+);
+CREATE TABLE IF NOT EXISTS mod_loaders (project_id TEXT, loader TEXT, PRIMARY KEY (project_id, loader));
+CREATE TABLE IF NOT EXISTS mod_versions (project_id TEXT, game_version TEXT, PRIMARY KEY (project_id, game_version));
+CREATE INDEX IF NOT EXISTS mod_loaders_loader ON mod_loaders(loader);
+CREATE INDEX IF NOT EXISTS mod_versions_version ON mod_versions(game_version);
+CREATE VIRTUAL TABLE IF NOT EXISTS mods_fts USING fts5(title, description, categories, content='mods', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2');
+CREATE TRIGGER IF NOT EXISTS mods_fts_insert AFTER INSERT ON mods BEGIN
+    INSERT INTO mods_fts(rowid, title, description, categories) VALUES (new.rowid, new.title, new.description, new.categories);
+END;
+CREATE TRIGGER IF NOT EXISTS mods_fts_delete AFTER DELETE ON mods BEGIN
+    INSERT INTO mods_fts(mods_fts, rowid, title, description, categories) VALUES ('delete', old.rowid, old.title, old.description, old.categories);
+END;
+CREATE TRIGGER IF NOT EXISTS mods_fts_update AFTER UPDATE ON mods BEGIN
+    INSERT INTO mods_fts(mods_fts, rowid, title, description, categories) VALUES ('delete', old.rowid, old.title, old.description, old.categories);
+    INSERT INTO mods_fts(rowid, title, description, categories) VALUES (new.rowid, new.title, new.description, new.categories);
+END;
+"""
+
+LOADERS = {"fabric", "forge", "neoforge", "quilt", "liteloader", "rift", "modloader"}
+
+_db = None
+_lock = threading.RLock()
+
+def db_path():
+    return utils.get_config_dir() / 'catalog.db'
+
+def db():
+    global _db
+    with _lock:
+        if _db is None:
+            _db = sqlite3.connect(db_path(), check_same_thread=False, isolation_level=None)
+            _db.execute("PRAGMA journal_mode=WAL")
+            _db.executescript(SCHEMA)
+        return _db
+
+def upsert(mods):
+    # Fields a record doesn't carry (older mods.json entries lack loaders, say) keep their stored values.
+    mods = [m for m in mods if m.get("project_id")]
+    if not mods: return
+
+    with _lock:
+        conn = db()
+        conn.execute("BEGIN")
+        try:
+            for m in mods:
+                pid = m["project_id"]
+                categories = m.get("categories")
+                conn.execute(
+                    "INSERT INTO mods (project_id, slug, title, description, icon_url, downloads, categories) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(project_id) DO UPDATE SET "
+                    "slug = COALESCE(excluded.slug, slug), title = COALESCE(excluded.title, title), "
+                    "description = COALESCE(excluded.description, description), icon_url = COALESCE(excluded.icon_url, icon_url), "
+                    "downloads = COALESCE(excluded.downloads, downloads), categories = COALESCE(excluded.categories, categories)",
+                    (pid, m.get("slug"), m.get("title"), m.get("description"), m.get("icon_url"), m.get("downloads"),
+                     json.dumps(categories) if categories is not None else None),
+                )
+
+                if m.get("loaders") is not None:
+                    conn.execute("DELETE FROM mod_loaders WHERE project_id = ?", (pid,))
+                    conn.executemany("INSERT OR IGNORE INTO mod_loaders VALUES (?, ?)", [(pid, l) for l in m["loaders"]])
+                if m.get("game_versions") is not None:
+                    conn.execute("DELETE FROM mod_versions WHERE project_id = ?", (pid,))
+                    conn.executemany("INSERT OR IGNORE INTO mod_versions VALUES (?, ?)", [(pid, v) for v in m["game_versions"]])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+def remember(mods):
+    # Feeding the catalog is best-effort; a locked or broken database must not fail a search.
+    try: upsert(mods)
+    except sqlite3.Error as e: print(f"[Catalog] Could not record {len(mods)} mods: {e}")
+
+def project_record(p):
+    return {
+        "project_id":     p["id"],
+        "slug":           p.get("slug"),
+        "title":          p.get("title"),
+        "description":    p.get("description"),
+        "icon_url":       p.get("icon_url"),
+        "downloads":      p.get("downloads"),
+        "categories":     p.get("categories"),
+        "loaders":        p.get("loaders"),
+        "game_versions":  p.get("game_versions"),
+    }
+
+def match_expr(text: str):
+    # Every word must match, the last one as a prefix so results follow the user's typing.
+    words = [w for w in "".join(c if c.isalnum() else " " for c in text).split() if w]
+    if not words: return None
+    return " ".join(f'"{w}"' for w in words[:-1]) + (" " if len(words) > 1 else "") + f'"{words[-1]}"*'
+
+def search(text: str = "", loader: str = None, game_version: str = None, project_ids=None, limit: int = 20):
+    # Mods with no known loaders/versions aren't filtered out by those fields.
+    sql = ["SELECT m.project_id, m.slug, m.title, m.description, m.icon_url, m.downloads, m.categories FROM mods m"]
+    where, params = [], []
+
+    expr = match_expr(text)
+    if expr:
+        sql.append("JOIN (SELECT rowid, bm25(mods_fts, 10, 1, 2) AS score FROM mods_fts WHERE mods_fts MATCH ?) f ON f.rowid = m.rowid")
+        params.append(expr)
+    elif text.strip():
+        return []
+
+    if loader:
+        where.append("(NOT EXISTS (SELECT 1 FROM mod_loaders l WHERE l.project_id = m.project_id) "
+                     "OR EXISTS (SELECT 1 FROM mod_loaders l WHERE l.project_id = m.project_id AND l.loader = ?))")
+        params.append(loader)
+    if game_version:
+        where.append("(NOT EXISTS (SELECT 1 FROM mod_versions v WHERE v.project_id = m.project_id) "
+                     "OR EXISTS (SELECT 1 FROM mod_versions v WHERE v.project_id = m.project_id AND v.game_version = ?))")
+        params.append(game_version)
+    if project_ids is not None:
+        project_ids = list(project_ids)
+        if not project_ids: return []
+        where.append(f"m.project_id IN ({','.join('?' * len(project_ids))})")
+        params += project_ids
+
+    if where: sql.append("WHERE " + " AND ".join(where))
+    sql.append("ORDER BY " + ("f.score, " if expr else "") + "m.downloads DESC")
+    if limit:
+        sql.append("LIMIT ?")
+        params.append(limit)
+
+    with _lock:
+        rows = db().execute(" ".join(sql), params).fetchall()
+    return [
+        {
+            "project_id":   pid,
+            "slug":         slug,
+            "title":        title,
+            "description":  description,
+            "icon_url":     icon_url,
+            "downloads":    downloads or 0,
+            "categories":   json.loads(categories or "[]"),
+        }
+        for pid, slug, title, description, icon_url, downloads, categories in rows
+    ]
+
+def game_versions(project_ids=None):
+    sql, params = "SELECT DISTINCT game_version FROM mod_versions", []
+    if project_ids is not None:
+        project_ids = list(project_ids)
+        if not project_ids: return []
+        sql += f" WHERE project_id IN ({','.join('?' * len(project_ids))})"
+        params = project_ids
+    with _lock:
+        return [v for (v,) in db().execute(sql, params).fetchall()]
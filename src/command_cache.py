@@ -0,0 +1,78 @@
+from pathlib import Path
+import os, json, hashlib
+
+import utils, install_manifest, tracing
+
+# Launch commands are cached as templates with placeholders for the per-account
+# fields, keyed by every input that shapes the rest of the command.
+VOLATILE = {
+    "username":  "${cesena:username}",
+    "uuid":      "${cesena:uuid}",
+    "token":     "${cesena:token}",
+}
+
+def cache_path(version_id: str):
+    d = utils.get_config_dir() / 'commands'
+    d.mkdir(exist_ok=True)
+    return d / f"{version_id}.json"
+
+def cache_key(version_id: str, mc_dir: Path, options: dict):
+    chain = install_manifest.version_chain(version_id, mc_dir)
+    if not chain: return None
+
+    import minecraft_launcher_lib as mclib
+    h = hashlib.sha1()
+    h.update(mclib.utils.get_library_version().encode())
+    h.update(str(mc_dir).encode())
+    for vid, path, data in chain:
+        h.update(vid.encode())
+        h.update(path.read_bytes())
+
+        # The java binary is only picked if the runtime is installed, so its presence is an input too.
+        runtime = data.get("javaVersion", {}).get("component")
+        if runtime:
+            h.update(str(mclib.runtime.get_executable_path(runtime, mc_dir)).encode())
+
+    stable = {k: v for k, v in options.items() if k not in VOLATILE}
+    h.update(json.dumps(stable, sort_keys=True).encode())
+    return h.hexdigest()
+
+def fill(template: list[str], options: dict):
+    cmd = []
+    for arg in template:
+        for field, placeholder in VOLATILE.items():
+            if placeholder in arg: arg = arg.replace(placeholder, str(options.get(field, "")))
+        cmd.append(arg)
+    return cmd
+
+def get_command(version_id: str, mc_dir: Path, options: dict):
+    with tracing.span("command", version=version_id) as span:
+        command, cached = build_command(version_id, mc_dir, options)
+        span.set(cached=cached)
+    return command
+
+def build_command(version_id: str, mc_dir: Path, options: dict):
+    key = cache_key(version_id, mc_dir, options)
+    f = cache_path(version_id)
+
+    if key:
+        try:
+            cached = json.loads(f.read_text())
+            if cached.get("key") == key:
+                return fill(cached["command"], options), True
+        except (OSError, ValueError):
+            pass
+
+    import minecraft_launcher_lib as mclib
+    template = mclib.command.get_minecraft_command(
+        version = version_id,
+        minecraft_directory = mc_dir,
+        options = {**options, **VOLATILE},
+    )
+
+    if key:
+        tmp = f.with_suffix('.tmp')
+        tmp.write_text(json.dumps({"key": key, "command": template}))
+        os.replace(tmp, f)
+
+    return fill(template, options), False
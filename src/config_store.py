@@ -0,0 +1,138 @@
+from pathlib import Path
+from typing import Optional, TypedDict
+import os, copy, json, atexit, threading
+from PySide6.QtCore import QObject, Signal
+
+class ConfigData(TypedDict, total=False):
+    instance_order: list[str]
+
+class ModsData(TypedDict):
+    enabled_mods: list[dict]
+
+class AccountsData(TypedDict):
+    selected: Optional[str]
+    accounts: list[dict]
+
+SECTIONS = {
+    "config":    ("config.json",    lambda: ConfigData()),
+    "mods":      ("mods.json",      lambda: ModsData(enabled_mods=[])),
+    "accounts":  ("accounts.json",  lambda: AccountsData(selected=None, accounts=[])),
+}
+
+class ConfigStore(QObject):
+    changed = Signal(str)   # section name, after local edits and external reloads
+
+    WRITE_DELAY = 0.5
+
+    def __init__(self, config_dir: Path):
+        super().__init__()
+        self.dir = config_dir
+        self.data = {}
+        self.dirty = set()
+        self.written = {}
+        self.lock = threading.RLock()
+        self.timer = None
+        self.watcher = None
+        atexit.register(self.flush)
+
+    def path(self, name):
+        return self.dir / SECTIONS[name][0]
+
+    def read(self, name):
+        default = SECTIONS[name][1]()
+        try:
+            data = json.loads(self.path(name).read_text())
+        except (OSError, ValueError):
+            return default
+        if not isinstance(data, dict): return default
+        return {**default, **data}
+
+    def mtime(self, name):
+        try: return self.path(name).stat().st_mtime_ns
+        except OSError: return None
+
+    def section(self, name):
+        with self.lock:
+            if name not in self.data:
+                # Stat first: a write landing between the two is then seen as a change, not missed.
+                self.written[name] = self.mtime(name)
+                self.data[name] = self.read(name)
+            return self.data[name]
+
+    def get(self, name):
+        with self.lock:
+            return copy.deepcopy(self.section(name))
+
+    def put(self, name, data):
+        with self.lock:
+            self.data[name] = copy.deepcopy(data)
+            self.mark_dirty(name)
+
+    def edit(self, name, fn):
+        # fn mutates the live section in place and returns True if it changed anything
+        with self.lock:
+            if fn(self.section(name)): self.mark_dirty(name)
+
+    def mark_dirty(self, name):
+        with self.lock:
+            self.dirty.add(name)
+            if self.timer is None:
+                self.timer = threading.Timer(self.WRITE_DELAY, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+        self.changed.emit(name)
+
+    def flush(self):
+        with self.lock:
+            if self.timer: self.timer.cancel()
+            self.timer = None
+
+            for name in list(self.dirty):
+                f = self.path(name)
+                tmp = f.with_name(f.name + '.tmp')
+                try:
+                    text = json.dumps(self.data[name])
+                    with open(tmp, 'w') as fp:
+                        fp.write(text)
+                        fp.flush()
+                        os.fsync(fp.fileno())
+                    os.replace(tmp, f)
+                except (OSError, TypeError, ValueError) as e:
+                    # The section stays dirty, so the next edit (or exit) tries again.
+                    print(f"[Config] Could not save {f.name}: {e}")
+                    continue
+                self.dirty.discard(name)
+                self.written[name] = f.stat().st_mtime_ns
+
+    def watch(self):
+        # Must be called from the GUI thread once a QApplication exists.
+        from PySide6.QtCore import QFileSystemWatcher
+        if self.watcher: return
+        self.watcher = QFileSystemWatcher([str(self.dir)], self)
+        self.watcher.directoryChanged.connect(self.check_external)
+        self.watcher.fileChanged.connect(self.check_external)
+        self.rewatch()
+
+    def rewatch(self):
+        # Atomic replaces drop the watched inode, so re-add whatever exists now.
+        files = [str(self.path(name)) for name in SECTIONS if self.path(name).exists()]
+        missing = [f for f in files if f not in self.watcher.files()]
+        if missing: self.watcher.addPaths(missing)
+
+    def check_external(self, path=None):
+        # fileChanged names the section's file; directoryChanged (a file replaced or created) checks them all.
+        names = [name for name in SECTIONS if str(self.path(name)) == path] or list(SECTIONS)
+        for name in names:
+            f = self.path(name)
+            mtime = self.mtime(name)
+            if mtime is None: continue
+
+            with self.lock:
+                if name not in self.data or name in self.dirty: continue
+                if self.written.get(name) == mtime: continue
+                self.written[name] = mtime
+                self.data[name] = self.read(name)
+            print(f"[Config] Reloaded {f.name} after an external change.")
+            self.changed.emit(name)
+
+        if self.watcher: self.rewatch()
@@ -0,0 +1,221 @@
+from collections import defaultdict
+from urllib.parse import urlsplit
+from pathlib import Path
+import os, time, hashlib, threading
+import requests
+from PySide6.QtCore import QObject, Signal
+
+import net, tracing, pipeline
+
+MAX_PER_HOST = 4
+ATTEMPTS = 3
+
+MIN_BUFFER = 64 * 1024
+MAX_BUFFER = 1024 * 1024
+
+EMIT_INTERVAL = 0.1
+
+class DownloadSignals(QObject):
+    file_progress = Signal(str, "qlonglong", "qlonglong")  # name, bytes done, bytes total (0 if unknown)
+    file_finished = Signal(str)
+    progress = Signal("qlonglong", "qlonglong", int, int)  # bytes done, bytes total, files done, files total
+    error = Signal(str, str)
+
+signals = DownloadSignals()
+
+_host_slots = defaultdict(lambda: threading.BoundedSemaphore(MAX_PER_HOST))
+_dest_locks = defaultdict(threading.Lock)
+_lock = threading.Lock()
+
+class Batch:
+    def __init__(self):
+        self.files = {}
+        self.finished = set()
+        self.last_emit = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, name, size=0):
+        with self.lock:
+            self.files.setdefault(name, [0, size or 0])
+
+    def update(self, name, done, total, final=False):
+        with self.lock:
+            self.files[name] = [done, total or self.files.get(name, [0, 0])[1]]
+            if final: self.finished.add(name)
+
+            now = time.monotonic()
+            if not final and now - self.last_emit < EMIT_INTERVAL: return
+            self.last_emit = now
+
+            done_bytes = sum(d for d, _ in self.files.values())
+            total_bytes = sum(max(d, t) for d, t in self.files.values())
+            counts = len(self.finished), len(self.files)
+
+        signals.progress.emit(done_bytes, total_bytes, *counts)
+
+class HashMismatch(ValueError):
+    pass
+
+class Paused(Exception):
+    pass
+
+class Throttle:
+    # Shared byte budget for a group of downloads (rate in bytes/s, None for unlimited)
+    # that can also be paused. Downloads only wait between files; one paused mid-file
+    # drops its connection and later resumes the .part with a Range request.
+    def __init__(self, rate=None):
+        self.rate = rate
+        self.allowance = rate or 0
+        self.last = time.monotonic()
+        self.running = threading.Event()
+        self.running.set()
+        self.lock = threading.Lock()
+
+    def pause(self):
+        self.running.clear()
+
+    def resume(self):
+        self.running.set()
+
+    def consume(self, n):
+        if not self.running.is_set(): raise Paused()
+        if not self.rate: return
+        with self.lock:
+            now = time.monotonic()
+            self.allowance = min(self.rate, self.allowance + (now - self.last) * self.rate) - n
+            self.last = now
+            delay = -self.allowance / self.rate if self.allowance < 0 else 0
+        if delay:
+            time.sleep(delay)
+            if not self.running.is_set(): raise Paused()
+
+def hashers(hashes):
+    return {algo: hashlib.new(algo) for algo in (hashes or {}) if hashes[algo]}
+
+def check(hs, hashes, name):
+    for algo, h in hs.items():
+        if h.hexdigest() != hashes[algo].lower():
+            raise HashMismatch(f"{algo} mismatch for {name}")
+
+def matches(path: Path, hashes):
+    # True if path already holds the expected content; without hashes there's nothing to trust.
+    hs = hashers(hashes)
+    if not hs or not path.exists(): return False
+    with open(path, 'rb') as f:
+        while chunk := f.read(MAX_BUFFER):
+            for h in hs.values(): h.update(chunk)
+    try: check(hs, hashes, path.name)
+    except HashMismatch: return False
+    return True
+
+def fetch(url, part: Path, hs, name, batch, throttle=None):
+    offset = part.stat().st_size if part.exists() else 0
+    headers = {"Accept-Encoding": "identity"}
+    if offset: headers["Range"] = f"bytes={offset}-"
+
+    res = net.get(url, stream=True, headers=headers)
+    if res.status_code == 416:
+        res.close()
+        part.unlink()
+        offset = 0
+        del headers["Range"]
+        res = net.get(url, stream=True, headers=headers)
+
+    with res:
+        res.raise_for_status()
+
+        if offset and res.status_code != 206:
+            offset = 0
+
+        if offset:
+            with open(part, 'rb') as f:
+                while chunk := f.read(MAX_BUFFER):
+                    for h in hs.values(): h.update(chunk)
+
+        total = int(res.headers.get('Content-Length', 0))
+        total = total + offset if total else 0
+        done = offset
+
+        buf = MIN_BUFFER
+        last_emit = 0.0
+        with open(part, 'ab' if offset else 'wb') as f:
+            while True:
+                start = time.monotonic()
+                chunk = res.raw.read(buf, decode_content=True)
+                if not chunk: break
+
+                f.write(chunk)
+                for h in hs.values(): h.update(chunk)
+                done += len(chunk)
+
+                # Grow the buffer while reads keep filling it quickly.
+                if len(chunk) == buf and time.monotonic() - start < 0.05:
+                    buf = min(buf * 2, MAX_BUFFER)
+
+                # Once the last byte is in, a pause can wait for the next file.
+                if throttle and done != total: throttle.consume(len(chunk))
+                pipeline.check_cancelled()
+                if batch: batch.update(name, done, total)
+                if time.monotonic() - last_emit >= EMIT_INTERVAL:
+                    last_emit = time.monotonic()
+                    signals.file_progress.emit(name, done, total)
+
+    if total and done < total:
+        raise requests.exceptions.ChunkedEncodingError(f"{name} ended at {done}/{total} bytes")
+    return done
+
+def download(url, dest: Path, hashes=None, name=None, batch=None, throttle=None):
+    # hashes maps a hashlib algorithm name (sha1, sha512) to the expected hex digest
+    name = name or dest.name
+    with tracing.span("download", name=name, url=url) as span:
+        done = fetch_verified(url, dest, hashes, name, batch, throttle)
+        span.set(bytes=done)
+
+    signals.file_progress.emit(name, done, done)
+    signals.file_finished.emit(name)
+    if batch: batch.update(name, done, done, final=True)
+    return dest
+
+def fetch_verified(url, dest: Path, hashes, name, batch, throttle):
+    part = dest.with_name(dest.name + '.part')
+    dest.parent.mkdir(parents=True, exist_ok=True)
+
+    with _lock:
+        dest_lock = _dest_locks[dest]
+        host_slot = _host_slots[urlsplit(url).netloc]
+
+    while True:
+        # Wait out a pause holding nothing: no host slot, no dest lock, no open response.
+        if throttle: throttle.running.wait()
+        try:
+            with dest_lock:
+                # Whoever held the lock before us may have just downloaded this very file.
+                if matches(dest, hashes): return dest.stat().st_size
+                return fetch_attempts(url, dest, part, hashes, name, batch, throttle, host_slot)
+        except Paused:
+            print(f"[Downloader] {name} paused at {part.stat().st_size if part.exists() else 0} bytes.")
+
+def fetch_attempts(url, dest, part, hashes, name, batch, throttle, host_slot):
+    if batch: batch.add(name)
+
+    for attempt in range(1, ATTEMPTS + 1):
+        pipeline.check_cancelled()
+        hs = hashers(hashes)
+        try:
+            with host_slot:
+                done = fetch(url, part, hs, name, batch, throttle)
+            check(hs, hashes, name)
+            break
+        except HashMismatch as e:
+            part.unlink(missing_ok=True)
+            if attempt == ATTEMPTS:
+                signals.error.emit(name, str(e))
+                raise
+        except (requests.RequestException, OSError) as e:
+            if attempt == ATTEMPTS:
+                signals.error.emit(name, str(e))
+                raise
+            time.sleep(0.5 * 2 ** attempt)
+
+    os.replace(part, dest)
+    return done
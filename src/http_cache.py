@@ -0,0 +1,161 @@
+from email.utils import formatdate
+from urllib.parse import urlencode
+import os, re, json, time, hashlib, threading
+import requests
+
+import utils, net
+
+MAX_BYTES = 64 * 1024 * 1024
+
+# (url pattern, ttl seconds, stale-while-revalidate seconds)
+RULES = [
+    (r"version_manifest",       10 * 60,       7 * 86400),
+    (r"/search$",               5 * 60,        86400),
+    (r"/project/[^/]+/version", 30 * 60,       7 * 86400),
+    (r"/versions$",             86400,         30 * 86400),
+    (r"/projects$",             30 * 60,       7 * 86400),
+    (r"",                       0,             0),
+]
+
+_lock = threading.Lock()
+_revalidating = set()
+_total = None
+
+def get_cache_dir():
+    d = utils.get_config_dir() / 'http_cache'
+    d.mkdir(exist_ok=True)
+    return d
+
+def rule_for(url):
+    for pattern, ttl, swr in RULES:
+        if re.search(pattern, url): return ttl, swr
+
+def cache_key(url, params=None):
+    full = url + ('?' + urlencode(sorted((params or {}).items())) if params else '')
+    return hashlib.sha1(full.encode()).hexdigest()
+
+def load(key):
+    d = get_cache_dir()
+    try:
+        meta = json.loads((d / f"{key}.json").read_text())
+        body = (d / f"{key}.body").read_bytes()
+    except (OSError, ValueError):
+        return None
+    return meta, body
+
+def write_atomic(path, data: bytes):
+    tmp = path.with_name(path.name + f".{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+def store(key, url, res):
+    d = get_cache_dir()
+    meta = {
+        "url":            url,
+        "stored_at":      time.time(),
+        "etag":           res.headers.get("ETag"),
+        "last_modified":  res.headers.get("Last-Modified"),
+    }
+    body = res.content
+    old = d / f"{key}.body"
+    old_size = old.stat().st_size if old.exists() else 0
+
+    write_atomic(d / f"{key}.body", body)
+    write_atomic(d / f"{key}.json", json.dumps(meta).encode())
+
+    evict(len(body) - old_size)
+    return meta, body
+
+def refresh(key, meta):
+    meta["stored_at"] = time.time()
+    write_atomic(get_cache_dir() / f"{key}.json", json.dumps(meta).encode())
+
+def touch(key):
+    try: os.utime(get_cache_dir() / f"{key}.body")
+    except OSError: pass
+
+def evict(delta):
+    global _total
+    d = get_cache_dir()
+    with _lock:
+        if _total is None:
+            _total = sum(f.stat().st_size for f in d.glob('*.body'))
+        else:
+            _total += delta
+        if _total <= MAX_BYTES: return
+
+        bodies = sorted(d.glob('*.body'), key=lambda f: f.stat().st_mtime)
+        for f in bodies:
+            if _total <= MAX_BYTES * 0.8: break
+            try:
+                size = f.stat().st_size
+                f.unlink()
+                f.with_suffix('.json').unlink(missing_ok=True)
+                _total -= size
+            except OSError:
+                pass
+
+def fetch(key, url, params, cached):
+    headers = {}
+    if cached:
+        meta, _ = cached
+        if meta.get("etag"): headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"): headers["If-Modified-Since"] = meta["last_modified"]
+        elif not meta.get("etag"): headers["If-Modified-Since"] = formatdate(meta["stored_at"], usegmt=True)
+
+    res = net.get(url, params=params, headers=headers)
+
+    if res.status_code == 304 and cached:
+        refresh(key, cached[0])
+        return cached[1]
+
+    res.raise_for_status()
+    return store(key, url, res)[1]
+
+def revalidate(key, url, params, cached):
+    with _lock:
+        if key in _revalidating: return
+        _revalidating.add(key)
+
+    def run():
+        try: fetch(key, url, params, cached)
+        except requests.RequestException: pass
+        finally:
+            with _lock: _revalidating.discard(key)
+
+    threading.Thread(target=run, daemon=True).start()
+
+def get(url, params=None):
+    key = cache_key(url, params)
+    ttl, swr = rule_for(url)
+    cached = load(key)
+
+    if cached:
+        age = time.time() - cached[0]["stored_at"]
+        if age < ttl:
+            touch(key)
+            return cached[1]
+        if age < ttl + swr:
+            touch(key)
+            revalidate(key, url, params, cached)
+            return cached[1]
+
+    try:
+        return fetch(key, url, params, cached)
+    except requests.RequestException:
+        # Offline or the server is failing: anything we have beats nothing.
+        if cached:
+            print(f"[Cache] Serving stale response for {url}")
+            return cached[1]
+        raise
+
+def get_json(url, params=None):
+    return json.loads(get(url, params))
+
+def clear():
+    global _total
+    with _lock:
+        for f in get_cache_dir().iterdir():
+            try: f.unlink()
+            except OSError: pass
+        _total = 0
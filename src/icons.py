@@ -0,0 +1,81 @@
+from collections import OrderedDict
+import hashlib
+from PySide6.QtCore import QObject, Signal, Qt
+from PySide6.QtGui import QImage, QPixmap
+
+import utils, net
+
+THUMB_SIZE = 84  # 2x the 42px cards so icons stay crisp on HiDPI screens
+MEMORY_ITEMS = 512
+
+def get_icons_dir():
+    d = utils.get_config_dir() / 'icons'
+    d.mkdir(exist_ok=True)
+    return d
+
+def thumb_path(url):
+    return get_icons_dir() / f"{hashlib.sha1(url.encode()).hexdigest()}.png"
+
+def load_thumbnail(url):
+    # Runs on a pool thread: only QImage is safe here, and only the thumbnail is returned.
+    path = thumb_path(url)
+    if path.exists():
+        img = QImage(str(path))
+        if not img.isNull(): return url, img
+
+    try:
+        r = net.get(url)
+        r.raise_for_status()
+    except Exception:
+        return url, None
+
+    img = QImage()
+    if not img.loadFromData(r.content): return url, None
+
+    if img.width() > THUMB_SIZE or img.height() > THUMB_SIZE:
+        img = img.scaled(THUMB_SIZE, THUMB_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    img.save(str(path), "PNG")
+    return url, img
+
+class IconService(QObject):
+    loaded = Signal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.memory = OrderedDict()
+        self.pending = set()
+        self.failed = set()
+
+    def pixmap(self, url):
+        pm = self.memory.get(url)
+        if pm is not None:
+            self.memory.move_to_end(url)
+            return pm
+
+        if url not in self.pending and url not in self.failed:
+            self.pending.add(url)
+            worker = utils.Worker(load_thumbnail, url)
+            worker.signals.result.connect(self._store)
+            utils.pool.start(worker)
+        return None
+
+    def _store(self, result):
+        url, img = result
+        self.pending.discard(url)
+
+        if img is None or img.isNull():
+            self.failed.add(url)
+            return
+
+        self.memory[url] = QPixmap.fromImage(img)
+        while len(self.memory) > MEMORY_ITEMS:
+            self.memory.popitem(last=False)
+
+        self.loaded.emit(url)
+
+_service = None
+
+def service():
+    global _service
+    if _service is None: _service = IconService()
+    return _service
@@ -0,0 +1,144 @@
+from pathlib import Path
+import os, json, time, hashlib
+
+import utils
+
+VERIFY_INTERVAL_DAYS = 7
+
+# Per-version record of a known-good install: the version JSON chain by hash, plus
+# every library, jar, native and asset file by size/mtime (libraries also by sha1,
+# hashed once and carried over while their stat is unchanged).
+
+def manifest_path(version_id: str):
+    d = utils.get_config_dir() / 'installs'
+    d.mkdir(exist_ok=True)
+    return d / f"{version_id}.json"
+
+def sha1_of(path: Path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+    return h.hexdigest()
+
+def version_chain(version_id: str, mc_dir: Path):
+    chain, seen = [], set()
+    vid = version_id
+    while vid and vid not in seen:
+        seen.add(vid)
+        path = mc_dir / "versions" / vid / f"{vid}.json"
+        try: data = json.loads(path.read_text())
+        except (OSError, ValueError): return None
+        chain.append((vid, path, data))
+        vid = data.get("inheritsFrom")
+    return chain
+
+def maven_path(name: str):
+    # group:artifact:version[:classifier][@ext] -> group/dirs/artifact/version/artifact-version[-classifier].ext
+    name, _, ext = name.partition('@')
+    group, artifact, version, *classifier = name.split(':')
+    filename = '-'.join([artifact, version, *classifier]) + '.' + (ext or 'jar')
+    return Path(*group.split('.'), artifact, version, filename)
+
+def library_paths(lib: dict, mc_dir: Path):
+    downloads = lib.get("downloads", {})
+    artifact = downloads.get("artifact")
+    if artifact and artifact.get("path"):
+        yield mc_dir / "libraries" / artifact["path"]
+    elif "name" in lib:
+        yield mc_dir / "libraries" / maven_path(lib["name"])
+
+    for classifier in downloads.get("classifiers", {}).values():
+        if classifier.get("path"): yield mc_dir / "libraries" / classifier["path"]
+
+def asset_paths(index_id: str, mc_dir: Path):
+    index = mc_dir / "assets" / "indexes" / f"{index_id}.json"
+    if not index.exists(): return
+    yield index
+    try: objects = json.loads(index.read_text()).get("objects", {})
+    except ValueError: return
+    for obj in objects.values():
+        h = obj["hash"]
+        yield mc_dir / "assets" / "objects" / h[:2] / h
+
+def collect(version_id: str, mc_dir: Path, chain):
+    libraries, others = set(), set()
+
+    for vid, json_path, data in chain:
+        others.add(mc_dir / "versions" / vid / f"{vid}.jar")
+        for lib in data.get("libraries", []):
+            libraries.update(library_paths(lib, mc_dir))
+
+        index_id = data.get("assetIndex", {}).get("id") or data.get("assets")
+        if index_id: others.update(asset_paths(index_id, mc_dir))
+
+        runtime = data.get("javaVersion", {}).get("component")
+        if runtime:
+            from minecraft_launcher_lib.runtime import get_executable_path
+            java = get_executable_path(runtime, mc_dir)
+            if java: others.add(Path(java))
+
+    natives = mc_dir / "versions" / version_id / "natives"
+    if natives.is_dir(): others.update(p for p in natives.rglob('*') if p.is_file())
+
+    return libraries, others
+
+def stat_of(path: Path):
+    try:
+        st = path.stat()
+        return [st.st_size, st.st_mtime_ns]
+    except OSError:
+        return None
+
+def load(version_id: str):
+    f = manifest_path(version_id)
+    if not f.exists(): return None
+    try: return json.loads(f.read_text())
+    except ValueError: return None
+
+def record(version_id: str, mc_dir: Path):
+    chain = version_chain(version_id, mc_dir)
+    if not chain: return None
+
+    old = load(version_id) or {}
+    old_files, old_hashes = old.get("files", {}), old.get("hashes", {})
+    libraries, others = collect(version_id, mc_dir, chain)
+
+    files, hashes = {}, {}
+    for path in libraries | others:
+        st = stat_of(path)
+        if not st: continue  # excluded by rules for this platform, or optional
+        rel = os.path.relpath(path, mc_dir)
+        files[rel] = st
+        if path in libraries:
+            hashes[rel] = old_hashes[rel] if old_files.get(rel) == st and rel in old_hashes else sha1_of(path)
+
+    manifest = {
+        "version_json":  {vid: sha1_of(path) for vid, path, _ in chain},
+        "files":         files,
+        "hashes":        hashes,
+        "verified_at":   time.time(),
+    }
+
+    f = manifest_path(version_id)
+    tmp = f.with_suffix('.tmp')
+    tmp.write_text(json.dumps(manifest))
+    os.replace(tmp, f)
+    return manifest
+
+def check(version_id: str, mc_dir: Path):
+    manifest = load(version_id)
+    if not manifest: return False
+
+    interval = utils.get_config().get("verify_interval_days", VERIFY_INTERVAL_DAYS)
+    if interval is not None and time.time() - manifest.get("verified_at", 0) > interval * 86400:
+        return False
+
+    chain = version_chain(version_id, mc_dir)
+    if not chain: return False
+    if {vid: sha1_of(path) for vid, path, _ in chain} != manifest.get("version_json"): return False
+
+    for rel, st in manifest.get("files", {}).items():
+        if stat_of(mc_dir / rel) != st: return False
+
+    return True
@@ -8,10 +8,11 @@ from PySide6.QtWidgets import (
     QPushButton,
     QMessageBox,
     QSizePolicy,
+    QApplication,
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, Signal
 from dataclasses import dataclass
-import utils, launcher, ui
+import utils, launcher, ui, downloader, logpump, sessions, tracing, prefetch, mod_loader
 
 @dataclass
 class Instance:
@@ -19,6 +20,8 @@ class Instance:
     path: str
 
 class InstanceManager(QWidget):
+    loaded = Signal()
+
     def __init__(self):
         super().__init__()
         
@@ -26,6 +29,9 @@ class InstanceManager(QWidget):
         self.selected_inst_path: str = None
 
         self.proc: launcher.sp.Popen = None
+        self.pump: logpump.LogPump = None
+        self.console: ui.Console = None
+        self.session_id: int = None
 
         self.main_layout = QVBoxLayout(self)
 
@@ -43,18 +49,44 @@ class InstanceManager(QWidget):
         self.play_btn.clicked.connect(self.handle_play)
         self.main_layout.addWidget(self.play_btn)
 
+        # Launches replay the mod lock; newer mod versions are only picked up from here.
+        self.update_btn = QPushButton("Update Mods")
+        self.update_btn.setCursor(Qt.PointingHandCursor)
+        self.update_btn.clicked.connect(self.handle_update_mods)
+        self.main_layout.addWidget(self.update_btn)
+
+        self.running_stages = set()
+        downloader.signals.progress.connect(self.on_download_progress)
+        launcher.signals.stage.connect(self.on_launch_stage)
+        tracing.signals.summary.connect(self.on_trace_summary)
+        utils.get_version_index().changed.connect(self.on_versions_changed)
+
         self.load_instances()
 
     
     def load_instances(self):
+        # The versions directory is scanned on a worker so a large install doesn't stall the window.
+        self.info_label.setText("Loading versions...")
+        worker = utils.Worker(utils.get_local_versions)()
+        worker.signals.result.connect(self.on_instances_loaded)
+        worker.signals.error.connect(self.onerror)
+        utils.pool.start(worker)
+
+    def on_instances_loaded(self, versions):
         self.instances = [
             Instance(
                 name = v.name,
                 path = str(v),
             )
-            for v in utils.get_local_versions()
+            for v in versions
         ]
         self.update_instances()
+        self.loaded.emit()
+
+    def on_versions_changed(self):
+        # Installed or deleted versions show up without a restart.
+        names = set(utils.get_version_index().entries)
+        if names != {inst.name for inst in self.instances}: self.load_instances()
 
     def update_instances(self):
         self.scrolla.clear()
@@ -66,11 +98,10 @@ class InstanceManager(QWidget):
         
         if not self.selected_inst_path: self.selected_inst_path = self.instances[0].path
 
+        self.update_play_btn()
+
         for inst in self.instances:
             is_selected = (inst.path == self.selected_inst_path)
-            
-            if is_selected:
-                self.play_btn.setText(f"Play ({utils.format_vid(inst.name)})")
 
             self.scrolla.addCard(
                 uid=inst.path,
@@ -79,14 +110,46 @@ class InstanceManager(QWidget):
                 show_delete=False 
             )
 
+    def update_play_btn(self):
+        inst = next((i for i in self.instances if i.path == self.selected_inst_path), None)
+        if inst: self.play_btn.setText(f"Play ({utils.format_vid(inst.name)})")
+        entry = inst and utils.get_version_index().get(inst.name)
+        self.update_btn.setVisible(bool(entry) and entry["loader"] != "vanilla")
+
+    def handle_update_mods(self):
+        entry = utils.get_version_index().get([v for v in self.instances if v.path == self.selected_inst_path][0].name)
+        self.update_pair = (entry["mc_version"], entry["loader"])
+
+        self.setEnabled(False)
+        self.update_btn.setText("Updating mods...")
+
+        worker = utils.Worker(mod_loader.update_lock)(*self.update_pair)
+        worker.signals.result.connect(self.on_mods_updated)
+        worker.signals.error.connect(self.onerror)
+        utils.pool.start(worker)
+
+    def on_mods_updated(self, diff):
+        self.setEnabled(True)
+        self.update_btn.setText("Update Mods")
+        mc_version, loader = self.update_pair
+
+        lines = [f"+ {filename}" for pid, filename in diff["added"]]
+        lines += [f"- {filename}" for pid, filename in diff["removed"]]
+        lines += [f"{old} -> {new}" for pid, old, new in diff["changed"]]
+        QMessageBox.information(self, "Mods Updated", f"{mc_version} ({loader}):\n" + ("\n".join(lines) if lines else "Everything is up to date."))
+
     def handle_play(self):
         version = [v for v in self.instances if v.path == self.selected_inst_path][0].name
 
-        self.window().hide()
-        
+        self.setEnabled(False)
+        self.play_btn.setText("Preparing...")
+
         print(f"PLAYING: {version}")
 
-        worker = utils.Worker(launcher.launch_mc)(version)
+        # Shift+Play skips the install fingerprint and re-verifies every game file.
+        force_verify = bool(QApplication.keyboardModifiers() & Qt.ShiftModifier)
+
+        worker = utils.Worker(launcher.launch_mc)(version, force_verify=force_verify)
 
         worker.signals.result.connect(self.launch_success)
         worker.signals.error.connect(self.onerror)
@@ -101,27 +164,58 @@ class InstanceManager(QWidget):
 
     def handle_select(self, path):
         self.selected_inst_path = path
-        self.update_instances()
+        self.scrolla.setSelected(path)
+        self.update_play_btn()
 
-    def launch_success(self, proc):
-        self.proc = proc
+    def launch_success(self, result):
+        self.proc, self.session_id = result
         
         self.window().hide()
         self.setEnabled(True)
+        self.update_play_btn()
+        prefetch.service().pause()
 
-        worker = utils.Worker(self.proc.communicate)
-        worker.signals.result.connect(self.mc_closed)
+        version = [v for v in self.instances if v.path == self.selected_inst_path][0].name
+        self.pump = logpump.LogPump(self.proc, logpump.new_session_dir(version))
+        self.pump.signals.finished.connect(self.mc_closed)
 
-        utils.pool.start(worker)
+        # Live output window, off unless `show_game_output` is set in config.json.
+        if utils.get_config().get("show_game_output"):
+            if self.console: self.console.close()
+            self.console = ui.Console(f"{utils.format_vid(version)} output")
+            self.pump.signals.lines.connect(self.console.append_lines)
+            self.console.show()
 
-    def mc_closed(self, output):
-        stdout, stderr = output
+        self.pump.start()
+
+    def mc_closed(self, returncode, tail):
         self.window().show()
-        if self.proc.returncode and self.proc.returncode != 0:
-            QMessageBox.critical(self, "Minecraft Crashed", (stdout+stderr)[-1000:])
+        prefetch.service().resume()
+        utils.pool.start(utils.Worker(sessions.end)(self.session_id, returncode, self.pump.log.dir))
+        if returncode != 0:
+            QMessageBox.critical(self, "Minecraft Crashed", tail[-1000:])
+
+    def on_launch_stage(self, stage, status):
+        if status == "running": self.running_stages.add(stage)
+        else: self.running_stages.discard(stage)
+
+        if self.isEnabled() or not self.running_stages: return
+        self.play_btn.setText(f"Preparing ({', '.join(sorted(self.running_stages))})...")
+
+    def on_trace_summary(self, path, summary):
+        stages = sorted(((name, ms) for name, ms in summary.items() if name == "launch" or name.startswith("stage.")), key=lambda x: -x[1])
+        lines = [f"{name.removeprefix('stage.')}: {ms:.0f} ms" for name, ms in stages]
+        self.play_btn.setToolTip("Last launch\n" + "\n".join(lines) + f"\n\nTrace: {path}")
+
+    def on_download_progress(self, done, total, files_done, files_total):
+        if self.isEnabled(): return
+        percent = f" ({done * 100 // total}%)" if total else ""
+        self.play_btn.setText(f"Downloading mods {files_done}/{files_total}{percent}")
 
     def onerror(self, *args):
         self.setEnabled(True)
+        self.update_btn.setText("Update Mods")
+        self.update_play_btn()
         print("Error:", *args)
         if len(args) >= 1 and isinstance(args[0], tuple) and len(args[0]) >= 3:
             QMessageBox.critical(self, "Error", f"Error:\n{args[0][1]}")
@@ -1,9 +1,9 @@
 import subprocess as sp
-import minecraft_launcher_lib as mclib
-import requests
+import shutil
 from pathlib import Path
+from PySide6.QtCore import QObject, Signal
 
-import utils, mod_loader
+import utils, install_manifest, command_cache, pipeline, sessions, tracing
 
 def clean_jars(version_id: str):
     mc_dir = utils.get_minecraft_dir()
@@ -12,37 +12,76 @@ def clean_jars(version_id: str):
         try: jar_path.unlink()
         except: pass
 
-def launch_mc(version_id: str):
+class LaunchSignals(QObject):
+    stage = Signal(str, str)   # stage name, status
+
+signals = LaunchSignals()
+
+def ensure_java(version_id: str, mc_dir: Path):
+    chain = install_manifest.version_chain(version_id, mc_dir) or []
+    runtime = next((data["javaVersion"]["component"] for _, _, data in chain if "javaVersion" in data), None)
+
+    if not runtime:
+        if not shutil.which("java"): print("[Launcher] No Java runtime requested by the version and none on PATH.")
+        return None
+
+    import minecraft_launcher_lib as mclib
+    java = mclib.runtime.get_executable_path(runtime, mc_dir)
+    if java: return java
+
+    print(f"[Launcher] Installing Java runtime {runtime}...")
+    mclib.runtime.install_jvm_runtime(runtime, mc_dir, callback={"setStatus": print, "setProgress": lambda v: None})
+    return mclib.runtime.get_executable_path(runtime, mc_dir)
+
+def launch_mc(version_id: str, force_verify: bool = False):
+    tracing.start(f"launch-{version_id}")
+    try:
+        with tracing.span("launch", version=version_id, force_verify=force_verify):
+            return prepare_and_spawn(version_id, force_verify)
+    finally:
+        tracing.finish()
+
+def prepare_and_spawn(version_id: str, force_verify: bool):
+    # Heavy imports stay out of module scope so the launcher window can paint first.
+    import minecraft_launcher_lib as mclib
+    import mod_loader
+
     mc_dir = utils.get_minecraft_dir()
 
     loader, version = utils.parse_version_id(version_id)
 
     clean_jars(version_id)
 
-    print(f"[Launcher] Verifying base game ({version_id})...")
-    mclib.install.install_minecraft_version(
-        version=version_id,
-        minecraft_directory=mc_dir,
-        callback={"setStatus": print, "setProgress": lambda v: None}
-    )
+    verified = not force_verify and install_manifest.check(version_id, mc_dir)
+
+    def install():
+        if verified:
+            print(f"[Launcher] Install fingerprint matches ({version_id}), skipping verification.")
+            return
+        print(f"[Launcher] Verifying base game ({version_id})...")
+        mclib.install.install_minecraft_version(
+            version=version_id,
+            minecraft_directory=mc_dir,
+            callback={"setStatus": print, "setProgress": lambda v: None}
+        )
+
+    def mods():
+        if loader and loader != "vanilla":
+            return mod_loader.prepare_mods(version, loader)
+
+    def libraries():
+        if verified: return
+        print("Verifying libraries and natives...")
+        mclib.install.install_libraries(
+            version_id,
+            utils.get_version_json(version_id, mc_dir).get('libraries', []),
+            mc_dir,
+            callback={"setStatus": print, "setProgress": lambda v: None},
+        )
+
+    def record():
+        if not verified: install_manifest.record(version_id, mc_dir)
 
-    if loader and loader != "vanilla":
-        try:
-            mod_loader.prepare_mods(version, loader)
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            print("Mod loading failed, attempting to play anyway...")
-
-    print("Verifying libraries and natives...")
-    
-    mclib.install.install_libraries(
-        version_id,
-        utils.get_version_json(version_id, mc_dir).get('libraries', []),
-        mc_dir,
-        callback={"setStatus": print, "setProgress": lambda v: None},
-    )
-        
     options = {
         "username": utils.get_selected_username(),
         "uuid": "",
@@ -52,13 +91,45 @@ def launch_mc(version_id: str):
         "gameDirectory": str(mc_dir),
     }
 
-    mc_cmd = mclib.command.get_minecraft_command(
-        version = version_id,
-        minecraft_directory = mc_dir,
-        options = options,
+    # install -> libraries ----> record
+    #         \-> java ------/-> command
+    # mods runs alongside all of it; a failure there still lets the game start.
+    prep = pipeline.Pipeline(
+        [
+            pipeline.Task("install",    install),
+            pipeline.Task("mods",       mods,       optional=True),
+            pipeline.Task("libraries",  libraries,  deps=("install",)),
+            pipeline.Task("java",       lambda: ensure_java(version_id, mc_dir),  deps=("install",)),
+            pipeline.Task("record",     record,     deps=("libraries", "java")),
+            pipeline.Task("command",    lambda: command_cache.get_command(version_id, mc_dir, options),  deps=("install", "java")),
+        ],
+        on_status = signals.stage.emit,
     )
 
+    results = prep.run()
+
+    if prep.tasks["mods"].status == pipeline.FAILED:
+        import traceback
+        traceback.print_exception(prep.tasks["mods"].error)
+        print("Mod loading failed, attempting to play anyway...")
+
+    print("[Launcher] Stages:", ", ".join(f"{name} {t:.2f}s" for name, (_, t) in prep.summary().items()))
+
+    mc_cmd = results["command"]
+
     # print("Launch Command:", ' '.join(mc_cmd))
 
-    proc = sp.Popen(mc_cmd, cwd=mc_dir, stdout=sp.PIPE, stderr=sp.PIPE, text=True)
-    return proc
\ No newline at end of file
+    # Everything that can fail happens before Popen: once the game runs, it must reach the log pump.
+    session_id = sessions.begin(version_id, loader, version, mc_dir / "mods")
+    try:
+        utils.get_version_index().touch(version_id)
+    except OSError as e:
+        print(f"[Launcher] Could not record last played time: {e}")
+
+    try:
+        with tracing.span("spawn"):
+            proc = sp.Popen(mc_cmd, cwd=mc_dir, stdout=sp.PIPE, stderr=sp.STDOUT)
+    except BaseException:
+        sessions.discard(session_id)
+        raise
+    return proc, session_id
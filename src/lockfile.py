@@ -0,0 +1,85 @@
+import os, json, time, threading
+
+import utils
+
+# One lock per (MC version, loader): the exact version record chosen for every
+# project in the resolved closure. Launches resolve from it with no API calls;
+# only projects it doesn't cover yet (new or still missing) go to Modrinth, and
+# update_lock re-resolves everything on request.
+
+def lock_path(mc_version: str, loader: str):
+    d = utils.get_config_dir() / 'locks'
+    d.mkdir(exist_ok=True)
+    return d / f"{mc_version}-{loader}.json"
+
+def load(mc_version: str, loader: str):
+    try: lock = json.loads(lock_path(mc_version, loader).read_text())
+    except (OSError, ValueError): return None
+    return lock if isinstance(lock, dict) and "mods" in lock else None
+
+def save(lock: dict):
+    f = lock_path(lock["mc_version"], lock["loader"])
+    tmp = f.with_name(f.name + f".{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(lock, indent=2, sort_keys=True))
+    os.replace(tmp, f)
+
+def split(lock, ids):
+    # -> ({id: locked record}, ids to resolve online). Projects the lock lists as missing
+    # are asked for again, so one that gains a compatible version is picked up next launch.
+    found, rest = {}, []
+    for pid in ids:
+        canonical = lock["aliases"].get(pid, pid)
+        if canonical in lock["mods"]: found[pid] = lock["mods"][canonical]
+        else: rest.append(pid)
+    return found, rest
+
+def build(graph, wanted):
+    mods = {}
+    for pid, node in graph.nodes.items():
+        v = node.version
+        # Required deps are stored by project ID (pinned version IDs already mapped), so replaying the lock needs no lookups.
+        required = set(graph.edges.get(pid, ())) | {d["project_id"] for d in v.get("dependencies", []) if d.get("dependency_type") == "required" and d.get("project_id")}
+        deps = [{"project_id": dep, "dependency_type": "required"} for dep in sorted(required)]
+        deps += [{"project_id": d["project_id"], "dependency_type": d["dependency_type"]} for d in v.get("dependencies", []) if d.get("dependency_type") != "required" and d.get("project_id")]
+        mods[pid] = {
+            "project_id":    pid,
+            "version_id":    v.get("version_id"),
+            "filename":      v["filename"],
+            "url":           v["url"],
+            "hash":          v["hash"],
+            "sha512":        v.get("sha512"),
+            "size":          v.get("size"),
+            "requested":     node.requested,
+            "dependencies":  deps,
+        }
+
+    return {
+        "mc_version":  graph.mc_version,
+        "loader":      graph.loader,
+        "wanted":      sorted(wanted),
+        "aliases":     {pid: canonical for pid, canonical in graph.aliases.items() if pid != canonical},
+        "mods":        mods,
+        "missing":     sorted(graph.missing),
+    }
+
+def same(a, b):
+    strip = lambda lock: {k: v for k, v in (lock or {}).items() if k != "resolved_at"}
+    return strip(a) == strip(b)
+
+def diff(old, new):
+    old_mods, new_mods = (old or {}).get("mods", {}), new.get("mods", {})
+    return {
+        "added":    sorted((pid, m["filename"]) for pid, m in new_mods.items() if pid not in old_mods),
+        "removed":  sorted((pid, m["filename"]) for pid, m in old_mods.items() if pid not in new_mods),
+        "changed":  sorted(
+            (pid, old_mods[pid]["filename"], m["filename"])
+            for pid, m in new_mods.items()
+            if pid in old_mods and old_mods[pid].get("version_id") != m.get("version_id")
+        ),
+    }
+
+def write(lock: dict, old: dict = None):
+    if same(lock, old): return False
+    lock["resolved_at"] = time.time()
+    save(lock)
+    return True
@@ -0,0 +1,142 @@
+from collections import deque
+from pathlib import Path
+import os, time, gzip, codecs, shutil, threading
+from PySide6.QtCore import QObject, Signal
+
+import utils
+
+TAIL_CHARS = 64 * 1024
+ROTATE_BYTES = 8 * 1024 * 1024
+KEEP_PARTS = 10
+MAX_SESSIONS = 100
+
+EMIT_INTERVAL = 0.1
+MAX_EMIT_LINES = 500
+READ_SIZE = 64 * 1024
+
+class LogSignals(QObject):
+    lines = Signal(list)
+    finished = Signal(int, str)   # exit code, tail of the output
+
+def get_logs_dir():
+    d = utils.get_config_dir() / 'logs'
+    d.mkdir(exist_ok=True)
+    return d
+
+def new_session_dir(name: str):
+    logs = get_logs_dir()
+    sessions = sorted(p for p in logs.iterdir() if p.is_dir())
+    for old in sessions[:max(0, len(sessions) - MAX_SESSIONS + 1)]:
+        shutil.rmtree(old, ignore_errors=True)
+
+    d = logs / f"{time.strftime('%Y%m%d-%H%M%S')}-{name}"
+    d.mkdir(exist_ok=True)
+    return d
+
+def compress(path: Path):
+    with open(path, 'rb') as src, gzip.open(path.with_name(path.name + '.gz'), 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    path.unlink()
+
+class RotatingLog:
+    def __init__(self, session_dir: Path, compress=True):
+        self.dir = session_dir
+        self.compress = compress
+        self.path = session_dir / 'output.log'
+        self.part = 0
+        self.file = open(self.path, 'wb')
+        self.size = 0
+
+    def write(self, text: str):
+        data = text.encode('utf-8')
+        self.file.write(data)
+        self.size += len(data)
+        if self.size >= ROTATE_BYTES: self.rotate()
+
+    def rotate(self):
+        self.file.close()
+        self.part += 1
+        rotated = self.dir / f"output.{self.part}.log"
+        os.replace(self.path, rotated)
+        if self.compress:
+            threading.Thread(target=compress, args=(rotated,), daemon=True).start()
+
+        stale = self.part - KEEP_PARTS
+        if stale > 0:
+            for f in (self.dir / f"output.{stale}.log.gz", self.dir / f"output.{stale}.log"):
+                f.unlink(missing_ok=True)
+
+        self.file = open(self.path, 'wb')
+        self.size = 0
+
+    def close(self):
+        self.file.close()
+
+class LogPump:
+    def __init__(self, proc, session_dir: Path, compress=True):
+        self.proc = proc
+        self.log = RotatingLog(session_dir, compress)
+        self.signals = LogSignals()
+
+        self.tail = deque()
+        self.tail_size = 0
+        self.pending = []
+        self.skipped = 0
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self.read, daemon=True).start()
+        threading.Thread(target=self.flush_loop, daemon=True).start()
+        return self
+
+    def read(self):
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        partial = ''
+        pipe = self.proc.stdout
+        read = getattr(pipe, 'read1', pipe.read)
+
+        try:
+            while chunk := read(READ_SIZE):
+                text = partial + decoder.decode(chunk)
+                lines = text.split('\n')
+                partial = lines.pop()
+                if lines: self.push(lines)
+            partial += decoder.decode(b'', final=True)
+            if partial: self.push([partial])
+        finally:
+            self.proc.wait()
+            self.log.close()
+            self.done.set()
+
+    def push(self, lines):
+        self.log.write('\n'.join(lines) + '\n')
+        with self.lock:
+            for line in lines:
+                self.tail.append(line)
+                self.tail_size += len(line) + 1
+            while self.tail_size > TAIL_CHARS and len(self.tail) > 1:
+                self.tail_size -= len(self.tail.popleft()) + 1
+
+            self.pending += lines
+            if len(self.pending) > MAX_EMIT_LINES:
+                self.skipped += len(self.pending) - MAX_EMIT_LINES
+                del self.pending[:-MAX_EMIT_LINES]
+
+    def flush(self):
+        with self.lock:
+            batch, self.pending = self.pending, []
+            if self.skipped:
+                batch.insert(0, f"[... {self.skipped} lines skipped ...]")
+                self.skipped = 0
+        if batch: self.signals.lines.emit(batch)
+
+    def flush_loop(self):
+        while not self.done.wait(EMIT_INTERVAL):
+            self.flush()
+        self.flush()
+        self.signals.finished.emit(self.proc.returncode or 0, self.tail_text())
+
+    def tail_text(self):
+        with self.lock:
+            return '\n'.join(self.tail)
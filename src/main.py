@@ -1,11 +1,40 @@
 from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel
-from PySide6.QtCore import QSize
+from PySide6.QtCore import QSize, Qt, Signal, QTimer
 from PySide6.QtGui import QPixmap
-import sys
+import sys, importlib
 
-import utils, instances, auth, mods
+import utils
+
+class Placeholder(QLabel):
+    painted = Signal()
+
+    def __init__(self, text="Loading..."):
+        super().__init__(text)
+        self.setAlignment(Qt.AlignCenter)
+        self.setStyleSheet("color: gray;")
+        self.was_painted = False
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.was_painted:
+            self.was_painted = True
+            self.painted.emit()
+
+# Modules that create QObjects at import time; they're imported on the GUI thread
+# so those objects aren't owned by a pool thread.
+GUI_MODULES = ["tracing", "downloader", "launcher"]
+
+# Heavy imports with no QObjects of their own, pulled in on a worker while the window is already on screen.
+PRELOAD = ["requests", "minecraft_launcher_lib", "modrinth", "resolver", "sync", "catalog", "icons", "sessions", "pipeline", "command_cache"]
+
+def preload(names):
+    for name in names: importlib.import_module(name)
+    return names
 
 class Cesena(QMainWindow):
+    first_paint = Signal()
+    ready = Signal()
+
     def __init__(self):
         super().__init__()
 
@@ -25,25 +54,59 @@ class Cesena(QMainWindow):
         self.main_layout.addLayout(self.item_layout)
 
         self.ITEMS = [
-            { "name": "Instances", "item": instances.InstanceManager },
-            { "name": "Accounts", "item": auth.AuthManager },
-            { "name": "Mods", "item": mods.ModManager },
+            { "name": "Instances", "module": "instances", "item": "InstanceManager" },
+            { "name": "Accounts", "module": "auth", "item": "AuthManager" },
+            { "name": "Mods", "module": "mods", "item": "ModManager" },
         ]
 
+        # Managers are built once the window has painted; until then each column shows a placeholder.
         for item in self.ITEMS:
             label = QLabel(item['name'])
             label.setStyleSheet('font-size: 14pt;')
-            inst = item['item']()
-            item['inst'] = inst
+            item['inst'] = Placeholder()
 
             self.info_layout.addWidget(label)
-            self.item_layout.addWidget(inst)
+            self.item_layout.addWidget(item['inst'])
+
+        self.ITEMS[0]['inst'].painted.connect(self.on_first_paint)
 
         self.setCentralWidget(self.main_widget)
 
+    def on_first_paint(self):
+        self.first_paint.emit()
+        importlib.import_module("tracing")
+        worker = utils.Worker(preload)(PRELOAD)
+        worker.signals.result.connect(lambda _: QTimer.singleShot(0, self.build_managers))
+        worker.signals.error.connect(lambda _: self.build_managers())
+        utils.pool.start(worker)
+
+    def build_managers(self):
+        for name in GUI_MODULES: importlib.import_module(name)
+        for item in self.ITEMS:
+            placeholder = item['inst']
+            inst = getattr(importlib.import_module(item['module']), item['item'])()
+            item['inst'] = inst
+
+            self.item_layout.replaceWidget(placeholder, inst)
+            placeholder.deleteLater()
+
+        import prefetch
+        service = prefetch.service()
+        service.status.connect(self.on_prefetch_status)
+        service.done.connect(lambda mc_version, loader: self.statusBar().showMessage(f"Mods for {mc_version} ({loader}) are ready.", 5000))
+        service.schedule()
+        self.ready.emit()
+
+    def on_prefetch_status(self, text):
+        # An empty status ends the pass; a "ready" message still on screen times out by itself.
+        if text: self.statusBar().showMessage(text)
+        elif self.statusBar().currentMessage().startswith("Prefetching"): self.statusBar().clearMessage()
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    utils.get_store().watch()
+    utils.get_version_index().watch()
     # app.setDesktopFileName("com.uukelele.cesena")
     window = Cesena()
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    sys.exit(app.exec())
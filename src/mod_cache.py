@@ -0,0 +1,127 @@
+from pathlib import Path
+import os, json, shutil, hashlib, threading
+
+import utils, downloader
+
+# Content-addressed jar store shared by every version/loader pair:
+#   mods_cache/objects/<sha1[:2]>/<sha1>.jar   - the jars themselves
+#   mods_cache/index/<mc_version>-<loader>.json - filename -> hashes of the jar in use
+
+_verified = {}
+_lock = threading.Lock()
+
+def get_cache_dir():
+    return utils.get_config_dir() / 'mods_cache'
+
+def blob_path(sha1: str):
+    return get_cache_dir() / 'objects' / sha1[:2] / f"{sha1}.jar"
+
+def file_hashes(path: Path):
+    sha1, sha512 = hashlib.sha1(), hashlib.sha512()
+    with open(path, 'rb') as f:
+        while chunk := f.read(1 << 20):
+            sha1.update(chunk)
+            sha512.update(chunk)
+    return sha1.hexdigest(), sha512.hexdigest()
+
+def verify(path: Path, sha1: str, sha512: str = None):
+    try:
+        st = path.stat()
+    except OSError:
+        return False
+
+    stamp = (st.st_size, st.st_mtime_ns)
+    with _lock:
+        if _verified.get(path) == stamp: return True
+
+    got1, got512 = file_hashes(path)
+    ok = got1 == sha1.lower() and (not sha512 or got512 == sha512.lower())
+    if ok:
+        with _lock: _verified[path] = stamp
+    return ok
+
+def get(sha1: str, sha512: str = None):
+    path = blob_path(sha1)
+    if not path.exists(): return None
+    if verify(path, sha1, sha512): return path
+
+    print(f"  -> Cached {path.name} is corrupt, discarding.")
+    try: path.unlink()
+    except OSError: pass
+    return None
+
+def put(src: Path, sha1: str, sha512: str = None):
+    if not verify(src, sha1, sha512):
+        try: src.unlink()
+        except OSError: pass
+        raise ValueError(f"Hash mismatch for {src.name} (expected sha1 {sha1})")
+
+    dest = blob_path(sha1)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.replace(src, dest)
+    except OSError:
+        shutil.move(src, dest)
+
+    with _lock:
+        _verified.pop(src, None)
+        st = dest.stat()
+        _verified[dest] = (st.st_size, st.st_mtime_ns)
+    return dest
+
+def download(url: str, sha1: str, sha512: str = None, name: str = None, batch=None, throttle=None):
+    dest = downloader.download(url, blob_path(sha1), {"sha1": sha1, "sha512": sha512}, name=name, batch=batch, throttle=throttle)
+    st = dest.stat()
+    with _lock: _verified[dest] = (st.st_size, st.st_mtime_ns)
+    return dest
+
+def adopt_legacy(mc_version: str, loader: str, filename: str, sha1: str, sha512: str = None):
+    # Jars downloaded before the store existed live in mods_cache/<mc_version>-<loader>/
+    legacy_dir = get_cache_dir() / f"{mc_version}-{loader}"
+    legacy = legacy_dir / filename
+    if not legacy.is_file(): return None
+
+    if not verify(legacy, sha1, sha512):
+        legacy.unlink()
+        return None
+
+    dest = put(legacy, sha1, sha512)
+    try: legacy_dir.rmdir()
+    except OSError: pass
+    return dest
+
+def index_path(mc_version: str, loader: str):
+    return get_cache_dir() / 'index' / f"{mc_version}-{loader}.json"
+
+def load_index(mc_version: str, loader: str):
+    f = index_path(mc_version, loader)
+    if not f.exists(): return {}
+    try: return json.loads(f.read_text())
+    except: return {}
+
+def save_index(mc_version: str, loader: str, index: dict):
+    f = index_path(mc_version, loader)
+    f.parent.mkdir(parents=True, exist_ok=True)
+    # Prefetch and a launch can save the same index at once; each writer gets its own tmp file.
+    tmp = f.with_name(f.name + f".{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(index))
+    os.replace(tmp, f)
+
+def lookup(mc_version: str, loader: str, project_id: str):
+    for filename, entry in load_index(mc_version, loader).items():
+        if entry.get('project_id') == project_id:
+            path = get(entry['sha1'], entry.get('sha512'))
+            if path: return filename, path, entry
+    return None
+
+def known_hashes():
+    # project_id -> sha1 of any jar we hold for it, whatever version/loader it was for
+    hashes = {}
+    index_dir = get_cache_dir() / 'index'
+    if not index_dir.exists(): return hashes
+    for f in index_dir.glob('*.json'):
+        try: index = json.loads(f.read_text())
+        except: continue
+        for entry in index.values():
+            if entry.get('project_id'): hashes.setdefault(entry['project_id'], entry['sha1'])
+    return hashes
@@ -1,81 +1,129 @@
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import os, shutil, hashlib, requests
-from pathlib import Path
+import requests
 
-import utils, modrinth
+import utils, modrinth, mod_cache, sync, downloader, resolver, tracing, profiles, lockfile, pipeline
 
-def dl_file(url, path):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    res = requests.get(url, headers=modrinth.HEADERS, stream=True)
-    with open(path, 'wb') as f:
-        for chunk in res.iter_content(chunk_size=8192):
-            f.write(chunk)
+def fetch(version, mc_version, loader, batch=None, throttle=None):
+    sha1, sha512 = version['hash'], version.get('sha512')
 
-def resolve(mod, mc_version, loader, cache_dir):
-    print(f"-> Resolving {mod['project_id']}...")
-    version = modrinth.get_latest_version(mod['project_id'], mc_version, loader)
+    path = mod_cache.get(sha1, sha512) or mod_cache.adopt_legacy(mc_version, loader, version['filename'], sha1, sha512)
+    if path: return path
 
-    if not version:
-        print("  -> No compatible version found!")
-        return
+    return mod_cache.download(version['url'], sha1, sha512, name=version['filename'], batch=batch, throttle=throttle)
 
-    dest = cache_dir / version["filename"]
-    if not dest.exists():
-        print(f"  -> Downloading {version['filename']} to {dest}...")
-        dl_file(version['url'], dest)
+def resolve_batch(ids, mc_version, loader, offline=None):
+    print(f"-> Resolving {len(ids)} mods...")
+    try:
+        return modrinth.get_latest_versions(ids, mc_version, loader, known_hashes=mod_cache.known_hashes())
+    except requests.RequestException:
+        print("  -> Modrinth unreachable, using cached files.")
+        if offline is not None: offline.extend(ids)
+        results = {}
+        for pid in ids:
+            cached = mod_cache.lookup(mc_version, loader, pid)
+            if cached:
+                filename, path, entry = cached
+                results[pid] = {**entry, "filename": filename, "hash": entry['sha1']}
+        return results
 
-    return dest, version.get('dependencies', [])
+def resolve_locked(ids, mc_version, loader, lock, offline):
+    # Projects already in the lock replay their pinned version; only new ones go to Modrinth.
+    found, rest = lockfile.split(lock, ids) if lock else ({}, ids)
+    if rest: found.update(resolve_batch(rest, mc_version, loader, offline))
+    return found
 
+def resolve_and_fetch(mc_version: str, loader: str, workers: int = 8, throttle=None, progress: bool = True, use_lock: bool = True):
+    # Resolves the enabled mods for one MC version/loader pair and makes sure every
+    # jar is in the shared cache; returns {filename: (cached path, version record)}.
+    # The lock is replayed unless use_lock is False (see update_lock).
+    wanted = [mod['project_id'] for mod in utils.get_mods_config().get('enabled_mods', [])]
+    lock = lockfile.load(mc_version, loader)
+    offline = []
+
+    files = {}
+    batch = downloader.Batch() if progress else None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+
+        def on_resolved(version):
+            if batch: batch.add(version['filename'], version.get('size'))
+            futures[pipeline.submit(executor, fetch, version, mc_version, loader, batch, throttle)] = version
+
+        graph = resolver.resolve(
+            wanted, mc_version, loader,
+            resolve_batch = lambda ids: resolve_locked(ids, mc_version, loader, lock if use_lock else None, offline),
+            on_resolved = on_resolved,
+        )
+
+        for pid, parents in graph.missing.items():
+            print(f"  -> No compatible version found for {pid}" + (f" (required by {', '.join(sorted(parents))})" if parents else "") + "!")
+        for a, b in graph.conflicts:
+            print(f"  -> Warning: {a} is incompatible with {b}")
+        for cycle in graph.cycles:
+            print(f"  -> Dependency cycle: {' -> '.join(cycle)}")
+
+        for future in as_completed(futures):
+            version = futures[future]
+            try:
+                path = future.result()
+                files[version['filename']] = (path, version)
+                size = path.stat().st_size
+                if batch: batch.update(version['filename'], size, size, final=True)
+            except pipeline.Cancelled:
+                pass
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+
+    pipeline.check_cancelled()
+
+    # A resolution done from the offline cache would pin whatever happened to be cached, so it isn't locked.
+    if offline and not use_lock: raise requests.ConnectionError("Modrinth unreachable, lock left unchanged.")
+    if not offline and lockfile.write(lockfile.build(graph, wanted), lock):
+        print(f"  -> Locked {len(graph.nodes)} mods for {mc_version} ({loader}).")
+
+    save_index(mc_version, loader, files)
+    return files
+
+def update_lock(mc_version: str, loader: str, throttle=None, progress: bool = False):
+    # Re-resolves every enabled mod against Modrinth and returns what changed in the lock.
+    old = lockfile.load(mc_version, loader)
+    resolve_and_fetch(mc_version, loader, throttle=throttle, progress=progress, use_lock=False)
+    return lockfile.diff(old, lockfile.load(mc_version, loader) or {})
+
+def save_index(mc_version, loader, files):
+    mod_cache.save_index(mc_version, loader, {
+        filename: {
+            "project_id":    version.get('project_id'),
+            "version_id":    version.get('version_id'),
+            "sha1":          version['hash'],
+            "sha512":        version.get('sha512'),
+            "dependencies":  version.get('dependencies', []),
+        }
+        for filename, (path, version) in files.items()
+    })
+
+@tracing.traced("mods.prepare")
 def prepare_mods(mc_version: str, loader: str = 'fabric'):
     print(f"Loading mods for {mc_version} ({loader})...")
 
-    wanted = utils.get_mods_config().get('enabled_mods', [])
-    
-    mc_dir = utils.get_minecraft_dir()
-    mods_dir = mc_dir / 'mods'
-    cache_dir = utils.get_config_dir() / 'mods_cache' / f"{mc_version}-{loader}"
-    
-    cache_dir.mkdir(parents=True, exist_ok=True)
+    mods_dir = utils.get_minecraft_dir() / 'mods'
+    files = resolve_and_fetch(mc_version, loader)
+    wanted = { filename: (path, version['hash']) for filename, (path, version) in files.items() }
 
-    files = set()
-    processed = set()
+    # The profile's folder is kept between launches, so this sync is usually a no-op.
+    if profiles.enabled():
+        profile = profiles.mods_dir(mc_version, loader)
+        print(f"Syncing {len(files)} mods into profile {profile.parent.name}...")
+        report = sync.sync_dir(wanted, profile)
+        if profiles.activate(profile, mods_dir):
+            print(f"Mods Ready ({report}).")
+            return report
 
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        futures = {}
-        for mod in wanted:
-            if not mod['project_id'] in processed:
-                processed.add(mod['project_id'])
-                futures[executor.submit(resolve, mod, mc_version, loader, cache_dir)] = mod
-
-        while futures:
-            done, _ = as_completed(futures), None
-            for future in list(futures):
-                if future.done():
-                    mod = futures.pop(future)
-                    try:
-                        res = future.result()
-                        if res:
-                            path, deps = res
-                            files.add(path)
-
-                            for dep in deps:
-                                if dep.get("dependency_type") == "required":
-                                    print(f"  -> Adding dependency to queue: {dep['project_id']}")
-                                    processed.add(dep['project_id'])
-                                    futures[executor.submit(resolve, dep, mc_version, loader, cache_dir)] = dep
-                    except Exception as e:
-                        import traceback
-                        traceback.print_exc()
-
-    if mods_dir.exists():
-        for item in mods_dir.iterdir():
-            if item.is_file() and item.suffix == '.jar':
-                item.unlink()
-    else:
-        mods_dir.mkdir()
-
-    print(f"Copying {len(files)} mods...")
-    for file in files:
-        shutil.copy2(file, mods_dir / file.name)
-
-    print("Mods Ready.")
+    profiles.deactivate(mods_dir)
+    print(f"Syncing {len(files)} mods...")
+    report = sync.sync_dir(wanted, mods_dir)
+
+    print(f"Mods Ready ({report}).")
+    return report
@@ -1,64 +1,174 @@
-import requests
+import os
+from concurrent.futures import ThreadPoolExecutor
 from json import dumps as j
 
-HEADERS = {
-    "User-Agent": "uukelele-scratch/cesena/1.0",
-}
+import net, http_cache, catalog, pipeline
 
-BASE_URL = "https://api.modrinth.com/v2"
+HEADERS = net.HEADERS
 
-def search_mods(query: str):
+BASE_URL = os.getenv("CESENA_MODRINTH_API", "https://api.modrinth.com/v2")
+
+BATCH_SIZE = 100
+VERSION_TAIL = 8
+SEARCH_PAGE = 20
+
+def search_mods(query: str, offset: int = 0, limit: int = SEARCH_PAGE):
     url = BASE_URL + '/search'
 
-    res = requests.get(
+    hits = http_cache.get_json(
         url,
         params = {
             'query':   query,
             'facets':  j([['project_type:mod']]),
+            'offset':  offset,
+            'limit':   limit,
         },
-        headers = HEADERS,
-        timeout = 5.
-    )
-    res.raise_for_status()
-    hits = res.json().get('hits', [])
-    return [
+    ).get('hits', [])
+    results = [
         {
-            "project_id":   h["project_id"],
-            "title":        h["title"],
-            "description":  h["description"],
-            "icon_url":     h["icon_url"],
-            "downloads":    h["downloads"],
+            "project_id":     h["project_id"],
+            "slug":           h.get("slug"),
+            "title":          h["title"],
+            "description":    h["description"],
+            "icon_url":       h["icon_url"],
+            "downloads":      h["downloads"],
+            # Search hits list loaders among the categories.
+            "categories":     [c for c in h.get("categories", []) if c not in catalog.LOADERS],
+            "loaders":        [c for c in h.get("categories", []) if c in catalog.LOADERS],
+            "game_versions":  h.get("versions", []),
         }
         for h in hits
     ]
+    catalog.remember(results)
+    return results
 
 def get_latest_version(id, version, loader='fabric'):
     url = BASE_URL + f"/project/{id}/version"
     
-    res = requests.get(
+    versions = http_cache.get_json(
         url,
         params = {
             'loaders':        j([loader]),
             'game_versions':  j([version]),
         },
-        headers = HEADERS,
-        timeout = 5,
     )
-    res.raise_for_status()
-    versions = res.json()
 
     if not versions: return None
 
-    latest = versions[0]
+    return version_record(versions[0])
 
-    files = latest.get('files', [])
+def version_record(version):
+    files = version.get('files', [])
     primary = next((f for f in files if f.get('primary')), files[0] if files else None)
 
     if not primary: return None
 
     return {
+        "project_id":    version.get("project_id"),
+        "version_id":    version.get("id"),
         "filename":      primary["filename"],
         "url":           primary["url"],
         "hash":          primary["hashes"]["sha1"],
-        "dependencies":  latest.get("dependencies", []),
-    }
\ No newline at end of file
+        "sha512":        primary["hashes"].get("sha512"),
+        "size":          primary.get("size"),
+        "dependencies":  version.get("dependencies", []),
+    }
+
+def chunks(items, size=BATCH_SIZE):
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def get_projects(ids):
+    projects = []
+    for chunk in chunks(ids):
+        projects += http_cache.get_json(BASE_URL + '/projects', params={'ids': j(chunk)})
+    catalog.remember([catalog.project_record(p) for p in projects])
+    return projects
+
+def get_versions(ids):
+    versions = []
+    for chunk in chunks(ids):
+        versions += http_cache.get_json(BASE_URL + '/versions', params={'ids': j(chunk)})
+    return versions
+
+def get_updates(hashes, version, loader='fabric'):
+    updates = {}
+    for chunk in chunks(hashes):
+        res = net.post(
+            BASE_URL + '/version_files/update',
+            json = {
+                'hashes':         chunk,
+                'algorithm':      'sha1',
+                'loaders':        [loader],
+                'game_versions':  [version],
+            },
+        )
+        res.raise_for_status()
+        updates.update(res.json())
+    return updates
+
+def compatible(v, version, loader):
+    return loader in v.get('loaders', []) and version in v.get('game_versions', [])
+
+def get_latest_versions(ids, version, loader='fabric', known_hashes=None):
+    ids = list(dict.fromkeys(ids))
+    known_hashes = known_hashes or {}
+    results = {}
+
+    # Projects we already hold a jar for (any version/loader) resolve in one POST.
+    by_hash = {known_hashes[pid]: pid for pid in ids if pid in known_hashes}
+    if by_hash:
+        for h, v in get_updates(list(by_hash), version, loader).items():
+            pid = by_hash.get(h)
+            if pid and compatible(v, version, loader):
+                results[pid] = version_record(v)
+
+    rest = [pid for pid in ids if pid not in results]
+    if not rest: return results
+
+    projects = {}
+    for p in get_projects(rest):
+        projects[p['id']] = p
+        if p.get('slug'): projects[p['slug']] = p
+
+    candidates = {}
+    for pid in rest:
+        p = projects.get(pid)
+        if not p or not compatible(p, version, loader):
+            results[pid] = None
+        else:
+            candidates[pid] = p
+
+    # The newest few entries of a project's version list usually hold the answer, but the
+    # API doesn't promise an order: a tail answer is only trusted if the tail is the whole
+    # list, or the list's first entry and the tail are in publish order (oldest first).
+    # Anything else is asked per project below.
+    tails = {}
+    for p in candidates.values():
+        vids = p.get('versions', [])
+        tails[p['id']] = vids if len(vids) <= VERSION_TAIL else [vids[0]] + vids[-VERSION_TAIL:]
+    fetched = {v['id']: v for v in get_versions([vid for tail in tails.values() for vid in tail])}
+
+    latest = {}
+    for p in candidates.values():
+        tail = [fetched[vid] for vid in tails[p['id']] if vid in fetched]
+        dates = [v.get('date_published', '') for v in tail]
+        if dates != sorted(dates) and len(p.get('versions', [])) > VERSION_TAIL: continue
+        matches = [v for v in tail[-VERSION_TAIL:] if compatible(v, version, loader)]
+        if matches: latest[p['id']] = max(matches, key=lambda v: v.get('date_published', ''))
+
+    # No trusted match in the tail (it may only hold builds for other versions/loaders): ask per project.
+    missing = []
+    for pid, p in candidates.items():
+        v = latest.get(p['id'])
+        if v: results[pid] = version_record(v)
+        else: missing.append(pid)
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [pipeline.submit(executor, get_latest_version, pid, version, loader) for pid in missing]
+            for pid, future in zip(missing, futures):
+                results[pid] = future.result()
+
+    return results
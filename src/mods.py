@@ -7,16 +7,29 @@ from PySide6.QtWidgets import (
     QLineEdit,
     QSplitter,
     QMessageBox,
+    QComboBox,
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 
-import utils, modrinth, ui
+import utils, modrinth, ui, catalog
 
 class ModManager(QWidget):
+    SEARCH_DELAY_MS = 300
+    FILTER_LOADERS = ["fabric", "forge", "neoforge", "quilt"]
+
     def __init__(self):
         super().__init__()
 
         self.results = []
+        self.enabled_mods = []
+
+        # Each query bumps the generation; results from an older one are dropped on arrival.
+        self.generation = 0
+        self.query = ""
+        self.offset = 0
+        self.has_more = False
+        self.page_worker = None
+        self.showing_local = False
         
         self.main_layout = QVBoxLayout(self)
 
@@ -24,6 +37,12 @@ class ModManager(QWidget):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search Modrinth...")
         self.search_input.returnPressed.connect(self.search)
+        self.search_input.textChanged.connect(self.schedule_search)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.on_search_timer)
         
         self.search_btn = QPushButton("Search")
         self.search_btn.clicked.connect(self.search)
@@ -41,11 +60,29 @@ class ModManager(QWidget):
         l_layout.addWidget(self.search_info_label)
         self.results_list = ui.List()
         self.results_list.on_selection.connect(self.add_mod_from_search)
+        self.results_list.verticalScrollBar().valueChanged.connect(self.on_results_scrolled)
         l_layout.addWidget(self.results_list)
 
         self.installed_widget = QWidget()
         r_layout = QVBoxLayout(self.installed_widget)
         r_layout.addWidget(QLabel("Enabled Mods"))
+
+        filter_layout = QHBoxLayout()
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter enabled mods...")
+        self.filter_input.textChanged.connect(self.apply_filter)
+        self.loader_filter = QComboBox()
+        self.loader_filter.addItem("Any loader", None)
+        for loader in self.FILTER_LOADERS: self.loader_filter.addItem(loader.capitalize(), loader)
+        self.loader_filter.currentIndexChanged.connect(self.apply_filter)
+        self.version_filter = QComboBox()
+        self.version_filter.addItem("Any version", None)
+        self.version_filter.currentIndexChanged.connect(self.apply_filter)
+        filter_layout.addWidget(self.filter_input)
+        filter_layout.addWidget(self.loader_filter)
+        filter_layout.addWidget(self.version_filter)
+        r_layout.addLayout(filter_layout)
+
         self.installed_list = ui.List()
         self.installed_list.on_delete.connect(self.remove_mod)
         r_layout.addWidget(self.installed_list)
@@ -59,60 +96,174 @@ class ModManager(QWidget):
         
         self.refresh_installed_list()
 
+    def schedule_search(self):
+        self.search_timer.start()
+
+    def on_search_timer(self):
+        if self.search_input.text().strip() != self.query: self.search()
+
     def search(self):
+        self.search_timer.stop()
         query = self.search_input.text().strip()
-        if not query: return
-        
+
+        self.generation += 1
+        self.query = query
+        self.offset = 0
+        self.has_more = False
+        self.results = []
         self.results_list.clear()
-        self.search_btn.setText("Searching...")
-        self.search_btn.setEnabled(False)
-        
-        worker = utils.Worker(modrinth.search_mods)(query)
-        worker.signals.result.connect(self.on_search_results)
+        self.cancel_page()
+        self.page_worker = None
+
+        if not query:
+            self.search_info_label.setText("")
+            return
+
+        # Mods we've seen before show up straight from the local catalog; the Modrinth page then refines them.
+        local = catalog.search(query, limit=modrinth.SEARCH_PAGE)
+        self.showing_local = bool(local)
+        for mod in local: self.add_result_card(mod)
+        self.results = local
+
+        self.search_info_label.setText("Searching...")
+        self.load_page()
+
+    def cancel_page(self):
+        # A page still queued in the pool never hits the network; one already running is discarded by generation.
+        if self.page_worker: utils.pool.tryTake(self.page_worker)
+
+    def load_page(self):
+        if self.page_worker: return
+        generation, offset = self.generation, self.offset
+
+        worker = utils.Worker(modrinth.search_mods)(self.query, offset, modrinth.SEARCH_PAGE)
+        worker.signals.result.connect(lambda results: self.on_search_results(generation, offset, results))
+        worker.signals.error.connect(lambda error: self.on_search_error(generation, error))
+        worker.signals.finished.connect(lambda: self.page_done(worker))
+        self.page_worker = worker
         utils.pool.start(worker)
 
-    def on_search_results(self, results):
-        self.search_btn.setText("Search")
-        self.search_btn.setEnabled(True)
-        self.results_list.clear()
+    def page_done(self, worker):
+        if self.page_worker is not worker: return
+        self.page_worker = None
+        # Once the new cards are laid out: a page that doesn't fill the view (no scrollbar) or
+        # arrives with the user already at the bottom wouldn't produce a scroll event.
+        QTimer.singleShot(0, self.load_more)
 
-        self.results = results
-        
-        if not results:
+    def on_results_scrolled(self, value):
+        self.load_more()
+
+    def load_more(self):
+        # Fetch the next page while the user still has a screen of results left.
+        bar = self.results_list.verticalScrollBar()
+        if self.has_more and bar.value() >= bar.maximum() - bar.pageStep():
+            self.load_page()
+
+    def on_search_error(self, generation, error):
+        if generation != self.generation: return
+        if self.showing_local: self.search_info_label.setText("Modrinth unreachable, showing known mods.")
+        else: self.search_info_label.setText(f"Search failed: {error[1]}")
+
+    def on_search_results(self, generation, offset, results):
+        if generation != self.generation or offset != self.offset: return
+
+        self.offset += len(results)
+        self.has_more = len(results) >= modrinth.SEARCH_PAGE
+
+        if offset == 0 and self.showing_local:
+            self.showing_local = False
+            self.refine_results(results)
+        elif not self.results and not results:
             self.search_info_label.setText("No results.")
             return
-        else: self.search_info_label.setText("")
+
+        self.search_info_label.setText("" if self.results else "No results.")
 
         for mod in results:
-            self.results_list.addCard(
-                uid=mod["project_id"], 
-                text=mod["title"],
-                description=f'{utils.short_num(mod.get("downloads", 0))} downloads • ' + mod.get('description', 'No description provided.'),
-                icon_url=mod.get('icon_url'),
-                is_selected=False,
-                show_delete=False,
-            )
+            if self.results_list.hasCard(mod["project_id"]): continue
+            self.results.append(mod)
+            self.add_result_card(mod)
+
+    def refine_results(self, results):
+        # Reorder the local hits to match Modrinth's ranking instead of rebuilding the list.
+        wanted = {mod["project_id"] for mod in results}
+        for uid in self.results_list.get_order():
+            if uid not in wanted: self.results_list.removeCard(uid)
+
+        self.results = []
+        for row, mod in enumerate(results):
+            self.results.append(mod)
+            if self.results_list.hasCard(mod["project_id"]):
+                self.results_list.moveCard(mod["project_id"], row)
+                self.results_list.updateCard(mod["project_id"], **self.result_card(mod))
+            else:
+                self.results_list.insertCard(row, uid=mod["project_id"], **self.result_card(mod))
+
+    def result_card(self, mod):
+        return {
+            "text":         mod["title"],
+            "description":  f'{utils.short_num(mod.get("downloads") or 0)} downloads • ' + (mod.get('description') or 'No description provided.'),
+            "icon_url":     mod.get('icon_url'),
+        }
+
+    def add_result_card(self, mod):
+        self.results_list.addCard(uid=mod["project_id"], is_selected=False, show_delete=False, **self.result_card(mod))
 
     def add_mod_from_search(self, id):
         mod = [m for m in self.results if m['project_id'] == id][0]
-        utils.add_mod(mod)
-        self.refresh_installed_list()
+        if not self.installed_list.hasCard(id):
+            utils.add_mod(mod)
+            self.enabled_mods.append(mod)
+            self.add_installed_card(mod)
+            self.refresh_filter_options()
+            self.apply_filter()
         QMessageBox.information(self, "Installed Mod", f"Installed mod ({mod['title']})")
 
     def remove_mod(self, id):
-        mod = [m for m in utils.get_mods_config().get("enabled_mods", []) if m['project_id'] == id][0]
+        mod = [m for m in self.enabled_mods if m['project_id'] == id][0]
         utils.rm_mod(mod)
-        self.refresh_installed_list()
+        self.enabled_mods.remove(mod)
+        self.installed_list.removeCard(id)
+        self.refresh_filter_options()
+
+    def add_installed_card(self, mod):
+        self.installed_list.addCard(
+            uid=mod['project_id'],
+            text=mod['title'],
+            description=mod.get('description') or 'No description provided.',
+            icon_url=mod.get('icon_url'),
+            is_selected=False,
+            show_delete=True,
+        )
 
     def refresh_installed_list(self):
         self.installed_list.clear()
-        mods = utils.get_mods_config().get("enabled_mods", [])
-        for mod in mods:
-            self.installed_list.addCard(
-                uid=mod['project_id'],
-                text=mod['title'],
-                description=mod.get('description', 'No description provided.'),
-                icon_url=mod.get('icon_url'),
-                is_selected=False,
-                show_delete=True,
-            )
\ No newline at end of file
+        self.enabled_mods = utils.get_mods_config().get("enabled_mods", [])
+        for mod in self.enabled_mods:
+            self.add_installed_card(mod)
+
+        worker = utils.Worker(catalog.remember)(list(self.enabled_mods))
+        worker.signals.finished.connect(self.refresh_filter_options)
+        utils.pool.start(worker)
+
+    def refresh_filter_options(self):
+        current = self.version_filter.currentData()
+        versions = catalog.game_versions(m['project_id'] for m in self.enabled_mods)
+        versions.sort(key=lambda v: [int(p) if p.isdigit() else 0 for p in v.split('.')], reverse=True)
+
+        self.version_filter.blockSignals(True)
+        self.version_filter.clear()
+        self.version_filter.addItem("Any version", None)
+        for v in versions: self.version_filter.addItem(v, v)
+        self.version_filter.setCurrentIndex(max(0, self.version_filter.findData(current)))
+        self.version_filter.blockSignals(False)
+
+    def apply_filter(self):
+        text = self.filter_input.text().strip()
+        loader, version = self.loader_filter.currentData(), self.version_filter.currentData()
+        if not (text or loader or version):
+            self.installed_list.filterCards(None)
+            return
+
+        matches = catalog.search(text, loader, version, project_ids=[m['project_id'] for m in self.enabled_mods], limit=None)
+        self.installed_list.filterCards({m['project_id'] for m in matches})
\ No newline at end of file
@@ -0,0 +1,103 @@
+from collections import defaultdict
+from urllib.parse import urlsplit
+import time, threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import tracing
+
+HEADERS = {
+    "User-Agent": "uukelele-scratch/cesena/1.0",
+}
+
+TIMEOUT = (5, 15)  # connect, read
+
+POOL_CONNECTIONS = 8
+POOL_MAXSIZE = 16
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_lock = threading.Lock()
+_stats = defaultdict(lambda: {"requests": 0, "errors": 0, "retries": 0, "total_ms": 0.0, "max_ms": 0.0})
+
+def make_retry():
+    return Retry(
+        total = 4,
+        backoff_factor = 0.5,
+        status_forcelist = RETRY_STATUSES,
+        allowed_methods = None,
+        respect_retry_after_header = True,
+        raise_on_status = False,
+    )
+
+def session():
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                s = requests.Session()
+                s.headers.update(HEADERS)
+                adapter = HTTPAdapter(
+                    pool_connections = POOL_CONNECTIONS,
+                    pool_maxsize = POOL_MAXSIZE,
+                    max_retries = make_retry(),
+                )
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _session = s
+    return _session
+
+def configure(pool_connections=None, pool_maxsize=None, timeout=None):
+    global _session, POOL_CONNECTIONS, POOL_MAXSIZE, TIMEOUT
+    with _lock:
+        if pool_connections: POOL_CONNECTIONS = pool_connections
+        if pool_maxsize: POOL_MAXSIZE = pool_maxsize
+        if timeout: TIMEOUT = timeout
+        old, _session = _session, None
+    if old: old.close()
+
+def request(method, url, **kwargs):
+    kwargs.setdefault('timeout', TIMEOUT)
+    host = urlsplit(url).netloc
+
+    start = time.perf_counter()
+    with tracing.span("http", method=method, url=url) as span:
+        try:
+            res = session().request(method, url, **kwargs)
+        except requests.RequestException:
+            record(host, start, error=True)
+            raise
+
+        retries = res.raw.retries.history if res.raw is not None and res.raw.retries else ()
+        record(host, start, error=res.status_code >= 400, retries=len(retries))
+        span.set(status=res.status_code, retries=len(retries))
+    return res
+
+def record(host, start, error=False, retries=0):
+    ms = (time.perf_counter() - start) * 1000
+    with _lock:
+        s = _stats[host]
+        s["requests"] += 1
+        s["errors"] += error
+        s["retries"] += retries
+        s["total_ms"] += ms
+        s["max_ms"] = max(s["max_ms"], ms)
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+def stats():
+    with _lock:
+        return {
+            host: {**s, "avg_ms": s["total_ms"] / s["requests"] if s["requests"] else 0.0}
+            for host, s in _stats.items()
+        }
+
+def reset_stats():
+    with _lock:
+        _stats.clear()
@@ -0,0 +1,121 @@
+from concurrent.futures import ThreadPoolExecutor, CancelledError, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+import time, threading, contextvars
+
+import tracing
+
+PENDING, RUNNING, DONE, FAILED, CANCELLED = "pending", "running", "done", "failed", "cancelled"
+
+class Cancelled(Exception):
+    pass
+
+# The running pipeline's cancel flag, visible to everything a stage calls (including
+# work it hands to other threads through submit()), so long downloads can stop early.
+_cancel = contextvars.ContextVar("pipeline_cancel", default=None)
+
+def check_cancelled():
+    event = _cancel.get()
+    if event is not None and event.is_set(): raise Cancelled()
+
+def submit(executor, fn, *args, **kwargs):
+    # Runs fn in a copy of the caller's context, so the cancel flag (and the active trace) follow it.
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+@dataclass
+class Task:
+    name: str
+    fn: Callable[[], Any]
+    deps: tuple[str, ...] = ()
+    optional: bool = False   # a failure is reported but does not stop the pipeline
+    status: str = PENDING
+    result: Any = None
+    error: Optional[BaseException] = None
+    started: float = 0.0
+    ended: float = 0.0
+
+    @property
+    def duration(self):
+        return (self.ended or time.perf_counter()) - self.started if self.started else 0.0
+
+class Pipeline:
+    def __init__(self, tasks: list[Task], max_workers: int = 4, on_status: Callable[[str, str], None] = None):
+        self.tasks = {t.name: t for t in tasks}
+        self.max_workers = max_workers
+        self.on_status = on_status
+        self.cancelled = threading.Event()
+
+        for t in tasks:
+            for dep in t.deps:
+                if dep not in self.tasks: raise ValueError(f"{t.name} depends on unknown task {dep}")
+
+    def set_status(self, task, status):
+        task.status = status
+        if self.on_status: self.on_status(task.name, status)
+
+    def ready(self, task):
+        if task.status != PENDING: return False
+        for dep in task.deps:
+            d = self.tasks[dep]
+            if d.status == DONE: continue
+            if d.status == FAILED and d.optional: continue
+            return False
+        return True
+
+    def run_task(self, task):
+        _cancel.set(self.cancelled)
+        check_cancelled()   # a worker can pick up a queued stage before run() gets to cancel it
+        task.started = time.perf_counter()
+        try:
+            with tracing.span(f"stage.{task.name}"):
+                return task.fn()
+        finally:
+            task.ended = time.perf_counter()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def result(self, name):
+        return self.tasks[name].result
+
+    def run(self):
+        failure = None
+        running = {}
+        # Leaving the with block joins every stage still running, so nothing outlives run():
+        # stages that check the cancel flag stop at their next file or chunk.
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                if not self.cancelled.is_set():
+                    for task in self.tasks.values():
+                        if self.ready(task):
+                            self.set_status(task, RUNNING)
+                            running[submit(executor, self.run_task, task)] = task
+
+                if not running: break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    try:
+                        task.result = future.result()
+                        self.set_status(task, DONE)
+                    except (Cancelled, CancelledError):
+                        self.set_status(task, CANCELLED)
+                    except BaseException as e:
+                        task.error = e
+                        self.set_status(task, FAILED)
+                        if not task.optional and failure is None:
+                            failure = e
+                            self.cancel()
+                            # Stages still queued never start.
+                            for f in running: f.cancel()
+
+        for task in self.tasks.values():
+            if task.status == PENDING: self.set_status(task, CANCELLED)
+
+        if failure: raise failure
+        if self.cancelled.is_set(): raise Cancelled()
+        return {name: t.result for name, t in self.tasks.items()}
+
+    def summary(self):
+        return {name: (t.status, round(t.duration, 3)) for name, t in self.tasks.items()}
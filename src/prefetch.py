@@ -0,0 +1,120 @@
+import threading, time
+import requests
+from PySide6.QtCore import QObject, Signal, QTimer
+
+import utils, mod_loader, downloader, lockfile
+
+# Resolves and downloads the enabled mods for every installed modded version
+# while the launcher is idle, so Play only has to sync from the local cache.
+# Settings (config.json): prefetch_enabled, prefetch_bandwidth_kbps, prefetch_workers,
+# lock_update_days (0 keeps mod locks until Update Mods is pressed).
+
+IDLE_DELAY_MS = 5000
+BANDWIDTH_KBPS = 2048
+WORKERS = 2
+
+class Prefetcher(QObject):
+    status = Signal(str)
+    done = Signal(str, str)   # mc version, loader
+
+    def __init__(self):
+        super().__init__()
+        self.throttle = downloader.Throttle()
+        self.thread = None
+        self.rerun = threading.Event()
+        self.last_pairs = set()
+        self.lock = threading.Lock()
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(IDLE_DELAY_MS)
+        self.timer.timeout.connect(self.start)
+
+    def schedule(self, *_):
+        self.timer.start()
+
+    def on_config_changed(self, name):
+        if name == "mods": self.schedule()
+
+    def on_versions_changed(self):
+        # Only a new or removed (MC version, loader) pair needs another pass.
+        with self.lock:
+            if set(self.pairs()) == self.last_pairs: return
+        self.schedule()
+
+    def pause(self):
+        self.throttle.pause()
+
+    def resume(self):
+        self.throttle.resume()
+
+    def pairs(self):
+        # Most recently played first, so the likeliest next launch is ready soonest.
+        index = utils.get_version_index()
+        entries = sorted((e for e in map(index.get, index.names()) if e), key=lambda e: -(e.get("last_played") or 0))
+        pairs = []
+        for e in entries:
+            pair = (e["mc_version"], e["loader"])
+            if e["loader"] != "vanilla" and pair not in pairs: pairs.append(pair)
+        return pairs
+
+    def lock_stale(self, mc_version, loader):
+        if not self.lock_update_days: return False
+        lock = lockfile.load(mc_version, loader)
+        return bool(lock) and time.time() - lock.get("resolved_at", 0) > self.lock_update_days * 86400
+
+    def start(self):
+        config = utils.get_config()
+        if not config.get("prefetch_enabled", True): return
+
+        kbps = config.get("prefetch_bandwidth_kbps", BANDWIDTH_KBPS)
+        self.throttle.rate = kbps * 1024 if kbps else None
+        self.workers = max(1, config.get("prefetch_workers", WORKERS))
+        self.lock_update_days = config.get("lock_update_days", 0)
+
+        with self.lock:
+            if self.thread and self.thread.is_alive():
+                self.rerun.set()
+                return
+            self.thread = threading.Thread(target=self.run, name="prefetch", daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while True:
+            self.rerun.clear()
+            if not utils.get_mods_config().get("enabled_mods"): break
+
+            with self.lock:
+                pairs = self.pairs()
+                self.last_pairs = set(pairs)
+            for mc_version, loader in pairs:
+                if self.rerun.is_set(): break
+                self.throttle.running.wait()
+                self.status.emit(f"Prefetching mods for {mc_version} ({loader})...")
+                try:
+                    if self.lock_stale(mc_version, loader):
+                        diff = mod_loader.update_lock(mc_version, loader, throttle=self.throttle)
+                        print(f"[Prefetch] {mc_version} ({loader}): lock updated, {sum(map(len, diff.values()))} changes.")
+                    else:
+                        files = mod_loader.resolve_and_fetch(mc_version, loader, workers=self.workers, throttle=self.throttle, progress=False)
+                        print(f"[Prefetch] {mc_version} ({loader}): {len(files)} mods cached.")
+                    self.done.emit(mc_version, loader)
+                except requests.RequestException as e:
+                    print(f"[Prefetch] {mc_version} ({loader}) skipped: {e}")
+                except Exception:
+                    import traceback
+                    traceback.print_exc()
+
+            if not self.rerun.is_set(): break
+
+        self.status.emit("")
+
+_service = None
+
+def service():
+    global _service
+    if _service is None:
+        _service = Prefetcher()
+        utils.get_store().changed.connect(_service.on_config_changed)
+        utils.get_version_index().changed.connect(_service.on_versions_changed)
+    return _service
@@ -0,0 +1,56 @@
+from pathlib import Path
+import os, time
+
+import utils
+
+# Each (MC version, loader) pair keeps its own materialised mods folder under
+# <config>/profiles, and .minecraft/mods is a symlink swapped to the one being
+# launched, so switching instances doesn't touch any jars.
+
+def get_profile_dir(mc_version: str, loader: str):
+    d = utils.get_config_dir() / 'profiles' / f"{mc_version}-{loader}"
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+def mods_dir(mc_version: str, loader: str):
+    return get_profile_dir(mc_version, loader) / 'mods'
+
+def backup_real_dir(link: Path):
+    # A mods folder from before profiles (or another launcher) is moved aside once, never deleted.
+    backup = link.with_name(link.name + '.cesena-backup')
+    if backup.exists(): backup = link.with_name(f"{link.name}.cesena-backup-{time.strftime('%Y%m%d-%H%M%S')}")
+    os.replace(link, backup)
+    print(f"[Profiles] Moved existing {link} to {backup}.")
+
+def activate(target: Path, link: Path):
+    # Points `link` at `target` with a single rename; returns False where symlinks aren't available.
+    if link.is_symlink() and Path(os.readlink(link)) == target: return True
+
+    tmp = link.with_name(f".{link.name}.{os.getpid()}.tmp")
+    try:
+        tmp.unlink(missing_ok=True)
+        os.symlink(target, tmp, target_is_directory=True)
+    except (OSError, NotImplementedError) as e:
+        print(f"[Profiles] Symlinks unavailable ({e}), syncing mods in place.")
+        return False
+
+    try:
+        if link.exists() and not link.is_symlink(): backup_real_dir(link)
+        os.replace(tmp, link)
+    except OSError:
+        # Windows can't rename over a directory link; fall back to remove-then-rename.
+        try:
+            if link.is_symlink(): link.unlink()
+            os.replace(tmp, link)
+        except OSError as e:
+            tmp.unlink(missing_ok=True)
+            print(f"[Profiles] Could not switch {link} ({e}), syncing mods in place.")
+            return False
+    return True
+
+def deactivate(link: Path):
+    # Before syncing into .minecraft/mods directly, make sure it isn't still a profile's folder.
+    if link.is_symlink(): link.unlink()
+
+def enabled():
+    return utils.get_config().get("mod_profiles", True)
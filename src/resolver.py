@@ -0,0 +1,142 @@
+from dataclasses import dataclass, field
+
+import modrinth, tracing, pipeline
+
+@dataclass
+class Node:
+    project_id: str
+    version: dict
+    requested: bool = False
+    required_by: set[str] = field(default_factory=set)
+
+@dataclass
+class ResolvedGraph:
+    mc_version: str
+    loader: str
+    nodes: dict[str, Node] = field(default_factory=dict)
+    aliases: dict[str, str] = field(default_factory=dict)         # requested id/slug -> project ID
+    edges: dict[str, set[str]] = field(default_factory=dict)      # project -> projects it requires
+    missing: dict[str, set[str]] = field(default_factory=dict)    # unresolvable project -> who wanted it
+    optional: dict[str, set[str]] = field(default_factory=dict)   # optional project -> who suggested it
+    embedded: dict[str, set[str]] = field(default_factory=dict)   # bundled project -> which jar bundles it
+    conflicts: list[tuple[str, str]] = field(default_factory=list)
+    cycles: list[list[str]] = field(default_factory=list)
+
+def find_cycles(edges):
+    # Tarjan's strongly connected components; any component with more than one
+    # member (or a self-loop) is a dependency cycle.
+    index, low, stack, on_stack, cycles = {}, {}, [], set(), []
+    counter = [0]
+
+    def connect(v):
+        index[v] = low[v] = counter[0]
+        counter[0] += 1
+        stack.append(v)
+        on_stack.add(v)
+        for w in edges.get(v, ()):
+            if w not in edges: continue
+            if w not in index:
+                connect(w)
+                low[v] = min(low[v], low[w])
+            elif w in on_stack:
+                low[v] = min(low[v], index[w])
+        if low[v] == index[v]:
+            component = []
+            while True:
+                w = stack.pop()
+                on_stack.discard(w)
+                component.append(w)
+                if w == v: break
+            if len(component) > 1 or v in edges.get(v, ()):
+                cycles.append(component[::-1])
+
+    for v in list(edges):
+        if v not in index: connect(v)
+    return cycles
+
+@tracing.traced("resolve")
+def resolve(wanted, mc_version, loader, resolve_batch, lookup_versions=modrinth.get_versions, on_resolved=None):
+    # resolve_batch(ids) -> {id: version record or None}; on_resolved(version) fires as soon
+    # as each project is known so downloads can start while later waves are still resolving.
+    graph = ResolvedGraph(mc_version, loader)
+    aliases = graph.aliases
+    queued = set()
+    incompatible = []
+
+    wave = {}
+    for pid in wanted:
+        if pid not in queued:
+            queued.add(pid)
+            wave[pid] = set()
+
+    requested = set(wave)
+
+    while wave:
+        pipeline.check_cancelled()
+        with tracing.span("resolve.wave", projects=len(wave)):
+            versions = resolve_batch(list(wave))
+        next_wave, pinned = {}, {}
+
+        for pid, parents in wave.items():
+            version = versions.get(pid)
+            if not version:
+                graph.missing[pid] = parents
+                continue
+
+            canonical = version.get('project_id') or pid
+            aliases[pid] = canonical
+            if canonical in graph.nodes:
+                graph.nodes[canonical].required_by |= parents
+                continue
+
+            queued.add(canonical)
+            graph.nodes[canonical] = Node(canonical, version, pid in requested, set(parents))
+            graph.edges[canonical] = set()
+            if on_resolved: on_resolved(version)
+
+            for dep in version.get('dependencies', []):
+                kind = dep.get('dependency_type')
+                dep_id = dep.get('project_id')
+
+                if kind == 'required':
+                    if dep_id:
+                        graph.edges[canonical].add(dep_id)
+                        if dep_id not in queued: next_wave.setdefault(dep_id, set()).add(canonical)
+                    elif dep.get('version_id'):
+                        pinned.setdefault(dep['version_id'], set()).add(canonical)
+                elif kind == 'optional' and dep_id:
+                    graph.optional.setdefault(dep_id, set()).add(canonical)
+                elif kind == 'embedded' and dep_id:
+                    graph.embedded.setdefault(dep_id, set()).add(canonical)
+                elif kind == 'incompatible' and dep_id:
+                    incompatible.append((canonical, dep_id))
+
+        # Dependencies pinned only by version ID need one extra lookup to find their project.
+        if pinned:
+            try: found = lookup_versions(list(pinned))
+            except Exception: found = []
+            for v in found:
+                dep_id = v['project_id']
+                for parent in pinned.pop(v['id'], ()):
+                    graph.edges[parent].add(dep_id)
+                    if dep_id not in queued: next_wave.setdefault(dep_id, set()).add(parent)
+            for vid, parents in pinned.items():
+                graph.missing[vid] = parents
+
+        for dep_id in next_wave: queued.add(dep_id)
+        wave = next_wave
+
+    for a, b in incompatible:
+        b = aliases.get(b, b)
+        if a in graph.nodes and b in graph.nodes:
+            graph.conflicts.append((a, b))
+
+    for pid in list(graph.optional):
+        if pid in graph.nodes: del graph.optional[pid]
+
+    for pid, deps in graph.edges.items():
+        deps.intersection_update(graph.nodes)
+        for dep in deps: graph.nodes[dep].required_by.add(pid)
+
+    graph.cycles = find_cycles(graph.edges)
+    return graph
@@ -0,0 +1,149 @@
+from pathlib import Path
+import time, gzip, sqlite3, hashlib, threading
+
+import utils, sync
+
+# Archive of every launched game session. Metadata lives in `sessions`; the full
+# log text sits in an FTS5 table sharing the session id as rowid, so crash
+# searches run against the index rather than the log files.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id          INTEGER PRIMARY KEY,
+    version_id  TEXT NOT NULL,
+    loader      TEXT,
+    mc_version  TEXT,
+    mods_hash   TEXT,
+    started     REAL NOT NULL,
+    ended       REAL,
+    duration    REAL,
+    exit_code   INTEGER,
+    log_dir     TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_started ON sessions(started);
+CREATE VIRTUAL TABLE IF NOT EXISTS session_logs USING fts5(text);
+"""
+
+COLUMNS = ("id", "version_id", "loader", "mc_version", "mods_hash", "started", "ended", "duration", "exit_code", "log_dir")
+
+_db = None
+_lock = threading.RLock()
+
+def db_path():
+    return utils.get_config_dir() / 'sessions.db'
+
+def db():
+    global _db
+    with _lock:
+        if _db is None:
+            conn = sqlite3.connect(db_path(), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            _db = conn
+        return _db
+
+def mods_hash(mods_dir: Path):
+    state = sync.load_state(mods_dir)
+    if not state: return None
+    h = hashlib.sha1()
+    for name in sorted(state):
+        h.update(f"{name}:{state[name][2]}\n".encode())
+    return h.hexdigest()
+
+def begin(version_id: str, loader: str, mc_version: str, mods_dir: Path = None):
+    # Returns None if the archive can't be written; a launch never fails over its record.
+    digest = mods_hash(mods_dir) if mods_dir and loader and loader != "vanilla" else None
+    try:
+        with _lock:
+            cur = db().execute(
+                "INSERT INTO sessions (version_id, loader, mc_version, mods_hash, started) VALUES (?, ?, ?, ?, ?)",
+                (version_id, loader, mc_version, digest, time.time()),
+            )
+            return cur.lastrowid
+    except sqlite3.Error as e:
+        print(f"[Sessions] Could not record session for {version_id}: {e}")
+        return None
+
+def discard(session_id: int):
+    # For a session whose game never started.
+    if session_id is None: return
+    try:
+        with _lock: db().execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+    except sqlite3.Error as e:
+        print(f"[Sessions] Could not discard session {session_id}: {e}")
+
+def read_log(log_dir: Path):
+    # Rotated parts first (oldest to newest), then the live file.
+    parts = {}
+    for f in log_dir.glob('output.*.log*'):
+        parts.setdefault(int(f.name.split('.')[1]), []).append(f)
+
+    chunks = []
+    for n in sorted(parts):
+        for f in sorted(parts[n], key=lambda f: f.suffix == '.gz'):   # plain file wins while it is still being compressed
+            try:
+                with (gzip.open(f, 'rt', encoding='utf-8', errors='replace') if f.suffix == '.gz' else open(f, errors='replace')) as fp:
+                    chunks.append(fp.read())
+                break
+            except (OSError, EOFError):
+                continue
+
+    live = log_dir / 'output.log'
+    if live.exists(): chunks.append(live.read_text(errors='replace'))
+    return ''.join(chunks)
+
+def end(session_id: int, exit_code: int, log_dir: Path = None):
+    if session_id is None: return
+    text = read_log(Path(log_dir)) if log_dir else ''
+    ended = time.time()
+    try:
+        with _lock:
+            conn = db()
+            started = conn.execute("SELECT started FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            if not started: return
+
+            conn.execute("BEGIN")
+            try:
+                conn.execute(
+                    "UPDATE sessions SET ended = ?, duration = ?, exit_code = ?, log_dir = ? WHERE id = ?",
+                    (ended, ended - started[0], exit_code, str(log_dir) if log_dir else None, session_id),
+                )
+                conn.execute("INSERT OR REPLACE INTO session_logs (rowid, text) VALUES (?, ?)", (session_id, text))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+    except sqlite3.Error as e:
+        print(f"[Sessions] Could not finish session {session_id}: {e}")
+
+def phrase(text: str):
+    # Treat the query as one literal phrase so dots, colons and quotes in stack traces don't hit FTS syntax.
+    return '"' + text.replace('"', '""') + '"'
+
+def query(sql: str, params=()):
+    rows = db().execute(sql, params).fetchall()
+    return [dict(zip(COLUMNS + ("snippet",), row)) for row in rows]
+
+def search(text: str, crashed: bool = False, version_id: str = None, limit: int = 50, oldest_first: bool = False):
+    sql = (
+        "SELECT s.*, snippet(session_logs, 0, '[', ']', '...', 16) FROM session_logs "
+        "JOIN sessions s ON s.id = session_logs.rowid WHERE session_logs MATCH ?"
+    )
+    params = [phrase(text)]
+    if crashed: sql += " AND s.exit_code != 0"
+    if version_id:
+        sql += " AND s.version_id = ?"
+        params.append(version_id)
+    sql += f" ORDER BY s.started {'ASC' if oldest_first else 'DESC'} LIMIT ?"
+    params.append(limit)
+    return query(sql, params)
+
+def crashes(text: str, limit: int = 50):
+    return search(text, crashed=True, limit=limit)
+
+def first_seen(text: str, version_id: str = None):
+    rows = search(text, version_id=version_id, limit=1, oldest_first=True)
+    return rows[0] if rows else None
+
+def recent(limit: int = 50):
+    rows = db().execute("SELECT * FROM sessions ORDER BY started DESC LIMIT ?", (limit,)).fetchall()
+    return [dict(zip(COLUMNS, row)) for row in rows]
@@ -0,0 +1,103 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+import os, sys, json, shutil, hashlib
+
+import tracing
+
+STATE_FILE = '.cesena-sync.json'
+
+FICLONE = 0x40049409
+
+@dataclass
+class SyncReport:
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    kept: list[str] = field(default_factory=list)
+
+    def __str__(self):
+        return f"{len(self.added)} added, {len(self.removed)} removed, {len(self.kept)} kept"
+
+def sha1_of(path: Path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+    return h.hexdigest()
+
+def reflink(src: Path, dest: Path):
+    if not sys.platform.startswith('linux'): raise OSError("reflink unsupported")
+    import fcntl
+    with open(src, 'rb') as s, open(dest, 'wb') as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            dest.unlink()
+            raise
+
+def place(src: Path, dest: Path):
+    tmp = dest.with_name(f".{dest.name}.tmp")
+    if tmp.exists(): tmp.unlink()
+
+    for method in (os.link, reflink, shutil.copy2):
+        try:
+            method(src, tmp)
+            break
+        except OSError:
+            if method is shutil.copy2: raise
+
+    os.replace(tmp, dest)
+
+def load_state(dest_dir: Path):
+    f = dest_dir / STATE_FILE
+    if not f.exists(): return {}
+    try: return json.loads(f.read_text())
+    except: return {}
+
+def save_state(dest_dir: Path, state: dict):
+    f = dest_dir / STATE_FILE
+    tmp = f.with_suffix('.tmp')
+    tmp.write_text(json.dumps(state))
+    os.replace(tmp, f)
+
+def matches(existing: Path, src: Path, sha1: str, recorded):
+    st = existing.stat()
+    src_st = src.stat()
+    if (st.st_dev, st.st_ino) == (src_st.st_dev, src_st.st_ino): return True
+    if st.st_size != src_st.st_size: return False
+    if recorded and recorded[:2] == [st.st_size, st.st_mtime_ns]: return recorded[2] == sha1
+    return sha1_of(existing) == sha1
+
+def sync_dir(files: dict, dest_dir: Path, suffix: str = '.jar'):
+    # files maps the wanted filename to (source path, sha1)
+    with tracing.span("sync", dest=str(dest_dir), files=len(files)) as span:
+        report = sync_files(files, dest_dir, suffix)
+        span.set(added=len(report.added), removed=len(report.removed), kept=len(report.kept))
+    return report
+
+def sync_files(files: dict, dest_dir: Path, suffix: str):
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    report = SyncReport()
+    old_state = load_state(dest_dir)
+    state = {}
+
+    for item in dest_dir.iterdir():
+        if item.suffix != suffix or not item.is_file(): continue
+        if item.name not in files:
+            item.unlink()
+            report.removed.append(item.name)
+
+    for name, (src, sha1) in files.items():
+        dest = dest_dir / name
+        if dest.is_file() and matches(dest, src, sha1, old_state.get(name)):
+            report.kept.append(name)
+        else:
+            place(src, dest)
+            report.added.append(name)
+
+        st = dest.stat()
+        state[name] = [st.st_size, st.st_mtime_ns, sha1]
+
+    if state != old_state: save_state(dest_dir, state)
+    return report
@@ -0,0 +1,141 @@
+from collections import defaultdict
+from functools import wraps
+import os, json, time, threading, contextvars
+from PySide6.QtCore import QObject, Signal
+
+import utils
+
+# Spans are only recorded while a trace is active (one per launch, when enabled
+# via the `trace_launches` config key or CESENA_TRACE=1). Otherwise span() hands
+# back a shared no-op, so instrumented code pays one context-variable read per call.
+# The active trace lives in a ContextVar: it covers the launching thread and work it
+# hands off through pipeline.submit, while the prefetcher, icon loads and cache
+# revalidation run in their own threads and stay out of it.
+
+MAX_TRACES = 50
+
+class TraceSignals(QObject):
+    summary = Signal(str, dict)   # trace file, {span name: total ms}
+
+signals = TraceSignals()
+
+_current = contextvars.ContextVar("trace", default=None)
+
+class Span:
+    __slots__ = ("trace", "name", "attrs", "tid", "start", "end")
+
+    def __init__(self, trace, name, attrs):
+        self.trace = trace
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.tid = threading.get_ident()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter_ns()
+        if exc_type: self.attrs["error"] = f"{exc_type.__name__}: {exc}"
+        self.trace.add(self)
+        return False
+
+class NullSpan:
+    __slots__ = ()
+    def set(self, **attrs): pass
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+NULL = NullSpan()
+
+class Trace:
+    def __init__(self, name):
+        self.name = name
+        self.origin = time.perf_counter_ns()
+        self.wall = time.time()
+        self.spans = []
+        self.threads = {}
+        self.token = None
+        self.lock = threading.Lock()
+
+    def add(self, span):
+        with self.lock:
+            self.spans.append(span)
+            if span.tid not in self.threads: self.threads[span.tid] = threading.current_thread().name
+
+    def chrome(self):
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"Cesena {self.name}"}}]
+        events += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}} for tid, name in self.threads.items()]
+        events += [
+            {
+                "name":  s.name,
+                "cat":   s.name.split(".")[0],
+                "ph":    "X",
+                "ts":    (s.start - self.origin) / 1000,
+                "dur":   (s.end - s.start) / 1000,
+                "pid":   pid,
+                "tid":   s.tid,
+                "args":  {k: v if isinstance(v, (int, float, str, bool, type(None))) else str(v) for k, v in s.attrs.items()},
+            }
+            for s in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"trace": self.name, "started": self.wall}}
+
+    def summary(self):
+        totals = defaultdict(float)
+        for s in self.spans:
+            totals[s.name] += (s.end - s.start) / 1e6
+        return {name: round(ms, 1) for name, ms in totals.items()}
+
+def enabled():
+    return os.getenv("CESENA_TRACE") == "1" or bool(utils.get_config().get("trace_launches"))
+
+def active():
+    return _current.get() is not None
+
+def span(name, /, **attrs):
+    trace = _current.get()
+    if trace is None: return NULL
+    return Span(trace, name, attrs)
+
+def traced(name=None):
+    def decorator(fn):
+        label = name or fn.__qualname__
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None: return fn(*args, **kwargs)
+            with span(label): return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def get_traces_dir():
+    d = utils.get_config_dir() / 'traces'
+    d.mkdir(exist_ok=True)
+    return d
+
+def start(name):
+    if not enabled(): return None
+    trace = Trace(name)
+    trace.token = _current.set(trace)
+    return trace
+
+def finish():
+    # Must run in the context that called start(): pool threads are reused, so the trace can't be left behind.
+    trace = _current.get()
+    if trace is None: return None
+    _current.reset(trace.token)
+
+    d = get_traces_dir()
+    f = d / f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(trace.wall))}-{trace.name}.json"
+    f.write_text(json.dumps(trace.chrome()))
+
+    old = sorted(d.glob('*.json'))
+    for stale in old[:max(0, len(old) - MAX_TRACES)]: stale.unlink(missing_ok=True)
+
+    summary = trace.summary()
+    signals.summary.emit(str(f), summary)
+    return f
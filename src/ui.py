@@ -1,206 +1,360 @@
 from PySide6.QtWidgets import (
-    QFrame,
-    QSizePolicy,
-    QListWidget,
+    QPlainTextEdit,
+    QListView,
+    QStyledItemDelegate,
     QAbstractItemView,
-    QListWidgetItem,
-    QHBoxLayout,
-    QVBoxLayout,
-    QLabel,
-    QPushButton,
-    QWidget,
+    QStyle,
 )
-from PySide6.QtCore import Qt, Signal, QRect
-from PySide6.QtGui import QDrag, QPixmap, QImage, QPainter, QFontMetrics
-import requests
-
-class OverflowEllipsisLabel(QLabel):
-    def __init__(self, text="", parent=None):
-        super().__init__(text, parent)
-        self.full_text = text
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
-        self.setToolTip(text)
-
-    def setText(self, text):
-        self.full_text = text
-        self.setToolTip(text)
-        self.update()
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        metrics = QFontMetrics(self.font())
-        elided = metrics.elidedText(self.full_text, Qt.ElideRight, self.width())
-        painter.drawText(self.rect(), self.alignment(), elided)
-
-class Card(QFrame):
-    clicked = Signal()
-
-    def __init__(self, uid, text, description=None, icon_url=None, icon_path=None, is_selected=False, show_delete=False, delete_cb=None):
-        super().__init__()
-        self.uid = uid
-        self.setObjectName("CardFrame")
-
-        self.setFrameShape(QFrame.NoFrame)
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
-
-        self.setStyleSheet(selected_style if is_selected else default_style)
-
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(10, 10, 10, 10)
-        layout.setSpacing(10)
-
-        self.icon_lbl = QLabel()
-        self.icon_lbl.setFixedSize(42, 42)
-        self.icon_lbl.setStyleSheet("background-color: transparent; border: none;")
-        self.icon_lbl.setScaledContents(True)
-        if icon_url or icon_path:
-            layout.addWidget(self.icon_lbl)
-            self.load_icon(icon_url, icon_path)
+from PySide6.QtCore import Qt, Signal, QRect, QSize, QEvent, QAbstractListModel, QModelIndex, QMimeData
+from PySide6.QtGui import QPixmap, QPainter, QFont, QFontMetrics, QColor, QFontDatabase
+
+import icons
+
+UidRole = Qt.UserRole
+CardRole = Qt.UserRole + 1
+
+default_style = {
+    "background":  QColor("#f0f0f0"),
+    "hover":       QColor("#e0e0e0"),
+    "text":        None,
+    "desc":        QColor("#555555"),
+}
+
+selected_style = {
+    "background":  QColor("#0d6efd"),
+    "hover":       QColor("#0b5ed7"),
+    "text":        QColor("white"),
+    "desc":        QColor("#e0e0e0"),
+}
+
+delete_style = {
+    "background":  QColor("#ee1313"),
+    "hover":       QColor("#cc0000"),
+    "text":        QColor("white"),
+}
+
+class CardModel(QAbstractListModel):
+    MIME_TYPE = "application/x-cesena-card-rows"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cards = []
+        self._rows = None
+        icons.service().loaded.connect(self._icon_loaded)
+
+    def row_of(self, uid):
+        if self._rows is None:
+            self._rows = {card["uid"]: row for row, card in enumerate(self.cards)}
+        return self._rows.get(uid, -1)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.cards)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid(): return None
+        card = self.cards[index.row()]
+
+        match role:
+            case Qt.DisplayRole:    return card["text"]
+            case Qt.ToolTipRole:    return card["description"]
+            case Qt.DecorationRole: return self.icon(card)
+            case _ if role == UidRole:  return card["uid"]
+            case _ if role == CardRole: return card
+        return None
+
+    def icon(self, card):
+        if card["icon_path"]:
+            if card.get("pixmap") is None: card["pixmap"] = QPixmap(str(card["icon_path"]))
+            if not card["pixmap"].isNull(): return card["pixmap"]
+        if card["icon_url"]:
+            return icons.service().pixmap(card["icon_url"])
+        return None
+
+    def _icon_loaded(self, url):
+        for row, card in enumerate(self.cards):
+            if card["icon_url"] == url:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def flags(self, index):
+        if not index.isValid(): return Qt.ItemIsDropEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled
+
+    def supportedDropActions(self):
+        return Qt.MoveAction
+
+    def mimeTypes(self):
+        return [self.MIME_TYPE]
+
+    def mimeData(self, indexes):
+        data = QMimeData()
+        data.setData(self.MIME_TYPE, ",".join(str(i.row()) for i in indexes).encode())
+        return data
+
+    def moveRows(self, source_parent, source_row, count, dest_parent, dest_row):
+        if count < 1 or source_row < 0 or source_row + count > len(self.cards): return False
+        if source_row <= dest_row <= source_row + count: return False
+        if not self.beginMoveRows(source_parent, source_row, source_row + count - 1, dest_parent, dest_row): return False
+
+        moved = self.cards[source_row:source_row + count]
+        del self.cards[source_row:source_row + count]
+        if dest_row > source_row: dest_row -= count
+        self.cards[dest_row:dest_row] = moved
+        self._rows = None
+
+        self.endMoveRows()
+        return True
+
+    def insert(self, row, card):
+        row = len(self.cards) if row < 0 or row > len(self.cards) else row
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.cards.insert(row, card)
+        if self._rows is not None and row == len(self.cards) - 1:
+            self._rows[card["uid"]] = row
         else:
-            self.icon_lbl.hide()
-
-        text_layout = QVBoxLayout()
-        text_layout.setSpacing(2)
-
-        self.title_label = QLabel(text)
-        self.title_label.setStyleSheet("font-weight: bold; font-size: 14px;")
-        text_layout.addWidget(self.title_label)
-
-        if description:
-            self.desc_lbl = OverflowEllipsisLabel(description)
-            self.desc_lbl.setObjectName("desc")
-            self.desc_lbl.setStyleSheet("font-size: 12px;")
-            text_layout.addWidget(self.desc_lbl)
-
-        layout.addLayout(text_layout)
-
-        layout.addStretch()
-
-        if show_delete:
-            btn = QPushButton("Delete")
-            btn.setCursor(Qt.PointingHandCursor)
-            btn.setStyleSheet("""
-                QPushButton { background-color: #ee1313; color: white; border: none; border-radius: 3px; padding: 5px 10px; }
-                QPushButton:hover { background-color: #c00; }
-            """)
-
-            if delete_cb:
-                btn.clicked.connect(lambda: delete_cb(self.uid))
-            layout.addWidget(btn)
-
-
-    def mousePressEvent(self, event):
-        event.ignore()
-
-    def load_icon(self, url=None, path=None):
-        if path:
-            pixmap = QPixmap(str(path))
-            if not pixmap.isNull():
-                self.icon_lbl.setPixmap(pixmap)
-                return
-
-        if url:
-            import utils 
-            worker = utils.Worker(self._download_image, url)
-            worker.signals.result.connect(self._set_icon_pixmap)
-            utils.pool.start(worker)
-
-    def _download_image(self, url):
-        try:
-            r = requests.get(url, timeout=3)
-            r.raise_for_status()
-            img = QImage()
-            img.loadFromData(r.content)
-            return QPixmap.fromImage(img)
-        except:
-            return None
-
-    def _set_icon_pixmap(self, pixmap):
-        if pixmap and not pixmap.isNull():
-            self.icon_lbl.setPixmap(pixmap)
-            self.icon_lbl.show()
-
-default_style = """
-    QFrame { background-color: #f0f0f0; border-radius: 5px; }
-    QFrame:hover { background-color: #e0e0e0; }
-    QLabel { background: transparent; }
-    QLabel#desc { color: #555555; }
-"""
-
-selected_style = """
-    QFrame { background-color: #0d6efd; border-radius: 5px; color: white; }
-    QFrame:hover { background-color: #0b5ed7; }
-    QLabel { background: transparent; color: white; }
-    QLabel#desc { color: #e0e0e0; }
-"""
-
-class List(QListWidget):
+            self._rows = None
+        self.endInsertRows()
+
+    def append(self, card):
+        self.insert(len(self.cards), card)
+
+    def remove(self, uid):
+        row = self.row_of(uid)
+        if row < 0: return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.cards[row]
+        self._rows = None
+        self.endRemoveRows()
+        return True
+
+    def update(self, uid, **fields):
+        row = self.row_of(uid)
+        if row < 0: return False
+        card = self.cards[row]
+        changed = {k: v for k, v in fields.items() if card.get(k) != v}
+        if not changed: return True
+        if "icon_path" in changed: card.pop("pixmap", None)
+        card.update(changed)
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def clear(self):
+        self.beginResetModel()
+        self.cards = []
+        self._rows = None
+        self.endResetModel()
+
+class CardDelegate(QStyledItemDelegate):
+    delete_clicked = Signal(str)
+
+    PADDING = 10
+    ICON_SIZE = 42
+    SPACING = 10
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.title_font = QFont()
+        self.title_font.setBold(True)
+        self.title_font.setPixelSize(14)
+        self.desc_font = QFont()
+        self.desc_font.setPixelSize(12)
+        self.button_font = QFont()
+        self.button_font.setPixelSize(12)
+        self.mouse_pos = None
+        self.consumed = False
+
+    def sizeHint(self, option, index):
+        card = index.data(CardRole)
+        height = QFontMetrics(self.title_font).height()
+        if card["description"]:
+            height += 2 + QFontMetrics(self.desc_font).height()
+        if card["icon_url"] or card["icon_path"]:
+            height = max(height, self.ICON_SIZE)
+        if card["show_delete"]:
+            height = max(height, QFontMetrics(self.button_font).height() + 10)
+        return QSize(option.rect.width(), height + self.PADDING * 2)
+
+    def button_rect(self, rect):
+        metrics = QFontMetrics(self.button_font)
+        w, h = metrics.horizontalAdvance("Delete") + 20, metrics.height() + 10
+        return QRect(rect.right() - self.PADDING - w, rect.center().y() - h // 2, w, h)
+
+    def paint(self, painter, option, index):
+        card = index.data(CardRole)
+        style = selected_style if card["is_selected"] else default_style
+        rect = option.rect
+        hovered = bool(option.state & QStyle.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(style["hover"] if hovered else style["background"])
+        painter.drawRoundedRect(rect, 5, 5)
+
+        x = rect.left() + self.PADDING
+        right = rect.right() - self.PADDING
+
+        pixmap = index.data(Qt.DecorationRole)
+        if card["icon_url"] or card["icon_path"]:
+            if pixmap and not pixmap.isNull():
+                icon_rect = QRect(x, rect.center().y() - self.ICON_SIZE // 2, self.ICON_SIZE, self.ICON_SIZE)
+                painter.setRenderHint(QPainter.SmoothPixmapTransform)
+                painter.drawPixmap(icon_rect, pixmap)
+            x += self.ICON_SIZE + self.SPACING
+
+        if card["show_delete"]:
+            btn = self.button_rect(rect)
+            over = hovered and self.mouse_pos is not None and btn.contains(self.mouse_pos)
+            painter.setBrush(delete_style["hover"] if over else delete_style["background"])
+            painter.drawRoundedRect(btn, 3, 3)
+            painter.setPen(delete_style["text"])
+            painter.setFont(self.button_font)
+            painter.drawText(btn, Qt.AlignCenter, "Delete")
+            right = btn.left() - self.SPACING
+
+        text_color = style["text"] or option.palette.color(option.palette.ColorRole.Text)
+        title_metrics = QFontMetrics(self.title_font)
+        desc_metrics = QFontMetrics(self.desc_font)
+        width = max(0, right - x)
+
+        text_height = title_metrics.height()
+        if card["description"]: text_height += 2 + desc_metrics.height()
+        y = rect.center().y() - text_height // 2
+
+        painter.setPen(text_color)
+        painter.setFont(self.title_font)
+        painter.drawText(QRect(x, y, width, title_metrics.height()), Qt.AlignLeft | Qt.AlignVCenter, title_metrics.elidedText(card["text"], Qt.ElideRight, width))
+
+        if card["description"]:
+            y += title_metrics.height() + 2
+            painter.setPen(style["desc"])
+            painter.setFont(self.desc_font)
+            painter.drawText(QRect(x, y, width, desc_metrics.height()), Qt.AlignLeft | Qt.AlignVCenter, desc_metrics.elidedText(card["description"], Qt.ElideRight, width))
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        card = index.data(CardRole)
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton and card["show_delete"]:
+            if self.button_rect(option.rect).contains(event.position().toPoint()):
+                self.consumed = True
+                self.delete_clicked.emit(card["uid"])
+                return True
+        return super().editorEvent(event, model, option, index)
+
+class List(QListView):
     on_reorder = Signal(list)
     on_selection = Signal(str)
     on_delete = Signal(str)
 
     def __init__(self):
         super().__init__()
-        
+
+        self.cards = CardModel(self)
+        self.setModel(self.cards)
+
+        self.delegate = CardDelegate(self)
+        self.delegate.delete_clicked.connect(self.on_delete.emit)
+        self.setItemDelegate(self.delegate)
+
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
         self.setDragEnabled(True)
         self.setAcceptDrops(True)
+        self.setDropIndicatorShown(True)
         self.setDragDropMode(QAbstractItemView.InternalMove)
-        
-        self.setStyleSheet("""
-            QListWidget { background: transparent; border: none; outline: none; }
-            QListWidget::item { background: transparent; border: none; }
-            QListWidget::item:selected { background: transparent; border: none; }
-            QListWidget::item:hover { background: transparent; border: none; }
-        """)
-        
+        self.setDefaultDropAction(Qt.MoveAction)
+
+        self.setStyleSheet("QListView { background: transparent; border: none; outline: none; }")
+
         self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setUniformItemSizes(True)
         self.setSpacing(5)
+        self.setMouseTracking(True)
 
-        self.itemClicked.connect(self._handle_click)
+        self.clicked.connect(self._handle_click)
 
     def addCard(self, uid, text, description=None, icon_url=None, icon_path=None, is_selected=False, show_delete=False):
-        card = Card(
-            uid=uid, 
-            text=text, 
-            description=description,
-            icon_url=icon_url,
-            icon_path=icon_path,
-            is_selected=is_selected, 
-            show_delete=show_delete,
-            delete_cb=self.on_delete.emit
-        )
+        self.insertCard(-1, uid, text, description, icon_url, icon_path, is_selected, show_delete)
+
+    def insertCard(self, row, uid, text, description=None, icon_url=None, icon_path=None, is_selected=False, show_delete=False):
+        self.cards.insert(row, {
+            "uid":          uid,
+            "text":         text,
+            "description":  description,
+            "icon_url":     icon_url,
+            "icon_path":    icon_path,
+            "is_selected":  is_selected,
+            "show_delete":  show_delete,
+        })
+
+    def removeCard(self, uid):
+        return self.cards.remove(uid)
+
+    def moveCard(self, uid, row):
+        src = self.cards.row_of(uid)
+        if src < 0: return False
+        # moveRows takes the destination as an insertion point before the move
+        dest = row + 1 if row > src else row
+        return src == row or self.cards.moveRows(QModelIndex(), src, 1, QModelIndex(), dest)
+
+    def updateCard(self, uid, **fields):
+        return self.cards.update(uid, **fields)
+
+    def setSelected(self, uid):
+        for card in self.cards.cards:
+            if card["is_selected"] and card["uid"] != uid:
+                self.cards.update(card["uid"], is_selected=False)
+        self.cards.update(uid, is_selected=True)
+
+    def filterCards(self, uids=None):
+        # Hide every card whose uid isn't in `uids`; None shows them all.
+        for row, card in enumerate(self.cards.cards):
+            self.setRowHidden(row, uids is not None and card["uid"] not in uids)
+
+    def hasCard(self, uid):
+        return self.cards.row_of(uid) >= 0
+
+    def clear(self):
+        self.cards.clear()
+
+    def count(self):
+        return self.cards.rowCount()
 
-        item = QListWidgetItem(self)        
-        item.setSizeHint(card.sizeHint())
+    def get_order(self):
+        return [card["uid"] for card in self.cards.cards]
 
-        item.setData(Qt.UserRole, uid)        
+    def _handle_click(self, index):
+        if self.delegate.consumed:
+            self.delegate.consumed = False
+            return
+        self.on_selection.emit(index.data(UidRole))
 
-        self.addItem(item)
-        self.setItemWidget(item, card)
+    def mouseMoveEvent(self, event):
+        super().mouseMoveEvent(event)
+        self.delegate.mouse_pos = event.position().toPoint()
+        self.viewport().update(self.visualRect(self.indexAt(self.delegate.mouse_pos)))
 
-    def get_order(self):
-        order = []
-        for i in range(self.count()):
-            item = self.item(i)
-            order.append(item.data(Qt.UserRole))
-        return order
-    
-    def _handle_click(self, item):
-        uid = item.data(Qt.UserRole)
-        self.on_selection.emit(uid)
+    def leaveEvent(self, event):
+        super().leaveEvent(event)
+        self.delegate.mouse_pos = None
 
     def dropEvent(self, event):
         super().dropEvent(event)
         self.on_reorder.emit(self.get_order())
 
-    def startDrag(self, supportedActions):
-        item = self.currentItem()
-        widget = self.itemWidget(item)
-        if not widget: return super().startDrag(supportedActions)
-
-        pixmap = widget.grab()
-        drag = QDrag(self)
-        drag.setMimeData(self.model().mimeData(self.selectedIndexes()))
-        drag.setPixmap(pixmap)
-        drag.setHotSpot(pixmap.rect().center())
-        drag.exec(supportedActions)
\ No newline at end of file
+class Console(QPlainTextEdit):
+    # Read-only live output; old lines fall off the top so memory stays bounded.
+    MAX_LINES = 5000
+
+    def __init__(self, title="Output", parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(self.MAX_LINES)
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.resize(900, 500)
+
+    def append_lines(self, lines):
+        self.appendPlainText("\n".join(lines))
@@ -1,10 +1,11 @@
 from pathlib import Path
-import os, platform, sys, shutil, json
+import os, platform, sys, shutil, json, copy
 from functools import lru_cache
 from typing import Optional
-import requests
 from PySide6.QtCore import QRunnable, QObject, Signal, QThreadPool
 
+import config_store, version_index
+
 class WorkerSignals(QObject):
     finished = Signal()
     error = Signal(tuple)
@@ -40,6 +41,7 @@ pool = QThreadPool()
 
 @lru_cache
 def get_minecraft_dir():
+    if os.getenv("CESENA_MINECRAFT_DIR"): return Path(os.getenv("CESENA_MINECRAFT_DIR"))
     match platform.system().lower():
         case "windows":
             return Path(os.getenv("APPDATA")) / ".minecraft"
@@ -54,92 +56,77 @@ def get_minecraft_dir():
 def get_config_dir(mc_path: Optional[Path] = None):
     if not mc_path: mc_path = get_minecraft_dir()
     config = mc_path / "cesena"
-    config.mkdir(exist_ok=True)
+    config.mkdir(parents=True, exist_ok=True)
     return config
 
+MANIFEST_URL = os.getenv("CESENA_MANIFEST_URL", "https://launchermeta.mojang.com/mc/game/version_manifest.json")
+
 @lru_cache()
 def get_online_versions():
-    res = requests.get("https://launchermeta.mojang.com/mc/game/version_manifest.json", timeout=5)
-    res.raise_for_status()
-    return res.json()
+    import http_cache
+    return http_cache.get_json(MANIFEST_URL)
+
+@lru_cache
+def get_version_index():
+    mc_dir = get_minecraft_dir()
+    return version_index.VersionIndex(mc_dir / 'versions', get_config_dir(mc_dir) / 'versions_index.json')
 
 def get_local_versions():
-    versions = get_minecraft_dir() / 'versions'
-    if not versions.exists(): return []
-    
-    dirs = [v for v in versions.iterdir() if v.is_dir()]
-    
-    config = get_config()
-    saved_order = config.get("instance_order", [])
+    index = get_version_index()
+    index.ensure()
+    order = get_config().get("instance_order", [])
+    with index.lock:
+        return [Path(index.entries[name]["path"]) for name in index.names(order)]
 
-    def sort(d):
-        try:
-            return saved_order.index(d.name)
-        except ValueError:
-            return 9999
-            
-    return sorted(dirs, key=sort)
+@lru_cache
+def get_store():
+    return config_store.ConfigStore(get_config_dir())
 
 def save_instance_order(names_list):
-    config = get_config()
-    config["instance_order"] = names_list
-    save_config(config)
+    def save(cfg):
+        cfg["instance_order"] = list(names_list)
+        return True
+    get_store().edit("config", save)
 
 def get_accounts():
-    accounts_path = get_config_dir() / 'accounts.json'
-
-    default = { "selected": None, "accounts": [] }
-
-    if (not accounts_path.exists()):
-        accounts_path.touch()
-        accounts_path.write_text(json.dumps(default))
-        return default
-    
-    try:
-        return json.loads(accounts_path.read_text())
-    except json.JSONDecodeError:
-        return default
+    return get_store().get("accounts")
     
 def get_selected_username():
     return get_accounts().get("selected", "player") or "player"
     
 def save_accounts(accounts):
-    accounts_path = get_config_dir() / 'accounts.json'
-    accounts_path.write_text(json.dumps(accounts))
+    get_store().put("accounts", accounts)
 
 def get_config_file():
-    return get_config_dir() / "config.json"
+    return get_store().path("config")
 
 def get_config():
-    f = get_config_file()
-    if not f.exists(): return {}
-    try: return json.loads(f.read_text())
-    except: return {}
+    return get_store().get("config")
 
 def save_config(data):
-    get_config_file().write_text(json.dumps(data))
+    get_store().put("config", data)
 
 def get_mods_config():
-    f = get_config_dir() / 'mods.json'
-    if not f.exists(): return {'enabled_mods': []}
-    return json.loads(f.read_text())
+    return get_store().get("mods")
 
 def save_mods_config(data):
-    f = get_config_dir() / 'mods.json'
-    f.write_text(json.dumps(data))
+    get_store().put("mods", data)
 
 def add_mod(mod):
-    cfg = get_mods_config()
-    if mod not in cfg["enabled_mods"]:
-        cfg["enabled_mods"].append(mod)
-        save_mods_config(cfg)
+    def add(cfg):
+        if mod in cfg["enabled_mods"]: return False
+        cfg["enabled_mods"].append(copy.deepcopy(mod))
+        return True
+    get_store().edit("mods", add)
 
 def rm_mod(mod):
-    cfg = get_mods_config()
-    if mod in cfg["enabled_mods"]:
+    def rm(cfg):
+        if mod not in cfg["enabled_mods"]: return False
         cfg["enabled_mods"].remove(mod)
-        save_mods_config(cfg)
+        return True
+    get_store().edit("mods", rm)
 
+@lru_cache(maxsize=4096)
 def parse_version_id(version_id: str, with_loader_version = False):
     vid = version_id.lower()
 
@@ -156,6 +143,7 @@ def parse_version_id(version_id: str, with_loader_version = False):
 
     return (*v, loader_version) if with_loader_version else v
 
+@lru_cache(maxsize=4096)
 def format_vid(version_id: str):
     loader, version, loader_version = parse_version_id(version_id, with_loader_version=True)
 
@@ -0,0 +1,148 @@
+from pathlib import Path
+import os, json, time, threading
+from PySide6.QtCore import QObject, Signal
+
+# Persisted metadata for every installed version, so listing them doesn't mean
+# re-reading each version JSON. Entries are revalidated by the JSON's and jar's
+# mtimes; after the first scan, the versions directory is only rescanned when its
+# own mtime moves (or the watcher reports a change).
+
+def stat(path: Path):
+    try: return path.stat()
+    except OSError: return None
+
+def describe(name: str, vdir: Path, json_stat, jar_stat=None):
+    import utils
+    loader, mc_version, loader_version = utils.parse_version_id(name, with_loader_version=True)
+    try: data = json.loads((vdir / f"{name}.json").read_text())
+    except (OSError, ValueError): data = {}
+
+    return {
+        "path":            str(vdir),
+        "loader":          loader,
+        "mc_version":      mc_version,
+        "loader_version":  loader_version,
+        "inherits_from":   data.get("inheritsFrom"),
+        "jar_size":        jar_stat.st_size if jar_stat else None,
+        "json_mtime_ns":   json_stat.st_mtime_ns if json_stat else None,
+        "jar_mtime_ns":    jar_stat.st_mtime_ns if jar_stat else None,
+        "last_played":     None,
+    }
+
+class VersionIndex(QObject):
+    changed = Signal()
+
+    def __init__(self, versions_dir: Path, index_file: Path):
+        super().__init__()
+        self.dir = versions_dir
+        self.file = index_file
+        self.lock = threading.RLock()
+        self.entries: dict[str, dict] = {}
+        self.paths: dict[str, str] = {}
+        self.scanned = False
+        self.dir_mtime = None
+        self.watcher = None
+        self.load()
+
+    def load(self):
+        try: entries = json.loads(self.file.read_text())
+        except (OSError, ValueError): entries = {}
+        if isinstance(entries, dict): self.set_entries(entries)
+
+    def set_entries(self, entries):
+        self.entries = entries
+        self.paths = {e["path"]: name for name, e in entries.items()}
+
+    def save(self):
+        tmp = self.file.with_name(self.file.name + '.tmp')
+        tmp.write_text(json.dumps(self.entries))
+        os.replace(tmp, self.file)
+
+    def scan_one(self, vdir: Path, old=None):
+        st, jar = stat(vdir / f"{vdir.name}.json"), stat(vdir / f"{vdir.name}.jar")
+        if old and st and old.get("json_mtime_ns") == st.st_mtime_ns and old.get("jar_mtime_ns") == (jar.st_mtime_ns if jar else None): return old
+        entry = describe(vdir.name, vdir, st, jar)
+        if old: entry["last_played"] = old.get("last_played")
+        return entry
+
+    def refresh(self):
+        # Stats each version JSON; only new or modified versions are read again.
+        with self.lock:
+            st = stat(self.dir)
+            entries = {}
+            if st:
+                for v in self.dir.iterdir():
+                    if v.is_dir(): entries[v.name] = self.scan_one(v, self.entries.get(v.name))
+
+            # The first scan builds what everyone reads; it isn't a change anyone has seen yet.
+            initial = not self.scanned
+            self.scanned = True
+            self.dir_mtime = st.st_mtime_ns if st else None
+            if entries == self.entries: return False
+            self.set_entries(entries)
+            self.save()
+
+        if not initial: self.changed.emit()
+        return True
+
+    def ensure(self):
+        # One stat of the versions directory; versions added, removed or renamed move its mtime.
+        st = stat(self.dir)
+        if not self.scanned or (st.st_mtime_ns if st else None) != self.dir_mtime: self.refresh()
+
+    def get(self, name: str):
+        self.ensure()
+        return self.entries.get(name)
+
+    def by_path(self, path):
+        self.ensure()
+        name = self.paths.get(str(path))
+        return self.entries.get(name) if name else None
+
+    def names(self, order: list[str] = ()):
+        # Versions in `order` first, in that order, then the rest by name.
+        self.ensure()
+        with self.lock:
+            pos = {name: i for i, name in enumerate(order)}
+            return sorted(self.entries, key=lambda n: (pos.get(n, len(pos)), n))
+
+    def touch(self, name: str):
+        with self.lock:
+            entry = self.entries.get(name)
+            if not entry: return
+            entry["last_played"] = time.time()
+            self.save()
+
+    def watch(self):
+        # Must be called from the GUI thread once a QApplication exists.
+        from PySide6.QtCore import QFileSystemWatcher
+        if self.watcher: return
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.watcher = QFileSystemWatcher([str(self.dir)], self)
+        self.watcher.directoryChanged.connect(self.on_dir_changed)
+        self.changed.connect(self.rewatch)
+        self.rewatch()
+
+    def rewatch(self):
+        with self.lock: paths = {e["path"] for e in self.entries.values()}
+        watched = set(self.watcher.directories())
+        wanted = paths | {str(self.dir)}
+        if stale := list(watched - wanted): self.watcher.removePaths(stale)
+        if missing := list(wanted - watched): self.watcher.addPaths(missing)
+
+    def on_dir_changed(self, path):
+        if path == str(self.dir):
+            self.refresh()
+            return
+
+        # A single version directory changed (e.g. its JSON was rewritten by an install).
+        with self.lock:
+            name = self.paths.get(path)
+            if not name: return
+            vdir = Path(path)
+            if not vdir.is_dir(): return
+            entry = self.scan_one(vdir, self.entries[name])
+            if entry == self.entries[name]: return
+            self.entries[name] = entry
+            self.save()
+        self.changed.emit()
@@ -0,0 +1,34 @@
+from pathlib import Path
+import os, sys
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / 'src'), str(ROOT / 'bench')]
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+import stub, utils, modrinth, catalog, sessions, http_cache
+
+@pytest.fixture(scope="session")
+def server():
+    srv = stub.StubServer().start()
+    yield srv
+    srv.stop()
+
+@pytest.fixture
+def mc_dir(tmp_path, monkeypatch):
+    # Every test gets its own Minecraft/config directory and fresh module-level state.
+    monkeypatch.setenv("CESENA_MINECRAFT_DIR", str(tmp_path))
+    for cached in (utils.get_minecraft_dir, utils.get_config_dir, utils.get_store, utils.get_version_index):
+        cached.cache_clear()
+    for module in (catalog, sessions):
+        if module._db: module._db.close()
+        monkeypatch.setattr(module, "_db", None)
+    monkeypatch.setattr(http_cache, "_total", None)
+    return tmp_path
+
+@pytest.fixture
+def api(server, mc_dir, monkeypatch):
+    monkeypatch.setattr(modrinth, "BASE_URL", server.url + "/v2")
+    server.reset()
+    return server
@@ -0,0 +1,76 @@
+import json, os
+
+import config_store
+
+def store(tmp_path):
+    s = config_store.ConfigStore(tmp_path)
+    s.WRITE_DELAY = 60  # flushed by hand below
+    return s
+
+def test_edits_are_written_on_flush(tmp_path):
+    s = store(tmp_path)
+    s.put("config", {"theme": "dark"})
+    assert not s.path("config").exists()
+
+    s.flush()
+
+    assert json.loads(s.path("config").read_text()) == {"theme": "dark"}
+    assert s.dirty == set()
+    assert store(tmp_path).get("config")["theme"] == "dark"
+
+def test_failed_write_stays_dirty_until_it_succeeds(tmp_path):
+    s = store(tmp_path)
+    s.put("config", {"theme": "dark"})
+    tmp = s.path("config").with_name(s.path("config").name + '.tmp')
+    tmp.mkdir()
+
+    s.flush()
+    assert s.dirty == {"config"}
+    assert not s.path("config").exists()
+
+    tmp.rmdir()
+    s.flush()
+    assert s.dirty == set()
+    assert json.loads(s.path("config").read_text()) == {"theme": "dark"}
+
+def test_external_changes_are_reloaded(tmp_path):
+    s = store(tmp_path)
+    s.put("config", {"theme": "dark"})
+    s.flush()
+    seen = []
+    s.changed.connect(seen.append)
+
+    f = s.path("config")
+    f.write_text(json.dumps({"theme": "light"}))
+    os.utime(f, ns=(0, f.stat().st_mtime_ns + 1_000_000))
+    s.check_external(str(f))
+
+    assert s.get("config")["theme"] == "light"
+    assert seen == ["config"]
+
+def test_own_writes_and_other_files_are_not_reloaded(tmp_path):
+    s = store(tmp_path)
+    s.put("config", {"theme": "dark"})
+    s.flush()
+    s.get("mods")
+    seen = []
+    s.changed.connect(seen.append)
+
+    s.check_external(str(tmp_path))
+    (tmp_path / 'unrelated.txt').write_text('x')
+    s.check_external(str(tmp_path / 'unrelated.txt'))
+
+    assert seen == []
+
+def test_pending_edits_win_over_external_changes(tmp_path):
+    s = store(tmp_path)
+    s.put("config", {"theme": "dark"})
+    s.flush()
+    s.put("config", {"theme": "blue"})
+
+    f = s.path("config")
+    f.write_text(json.dumps({"theme": "light"}))
+    os.utime(f, ns=(0, f.stat().st_mtime_ns + 1_000_000))
+    s.check_external(str(f))
+
+    assert s.get("config")["theme"] == "blue"
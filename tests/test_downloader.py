@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+import stub, downloader
+
+def jar(server, vid="mod0001v03"):
+    f = server.catalog.versions[vid]["files"][0]
+    return f["url"], f["hashes"], stub.payload(vid, f["size"])
+
+def test_download_verifies_and_moves_into_place(api, tmp_path):
+    url, hashes, data = jar(api)
+    dest = tmp_path / 'mods' / 'a.jar'
+
+    assert downloader.download(url, dest, hashes) == dest
+    assert dest.read_bytes() == data
+    assert not dest.with_name('a.jar.part').exists()
+    assert api.ranges == []
+
+def test_partial_download_resumes_with_range(api, tmp_path):
+    url, hashes, data = jar(api)
+    dest = tmp_path / 'a.jar'
+    dest.with_name('a.jar.part').write_bytes(data[:10_000])
+
+    downloader.download(url, dest, hashes)
+
+    assert api.ranges == [10_000]
+    assert dest.read_bytes() == data
+    assert not dest.with_name('a.jar.part').exists()
+
+def test_oversized_part_starts_over(api, tmp_path):
+    url, hashes, data = jar(api)
+    dest = tmp_path / 'a.jar'
+    dest.with_name('a.jar.part').write_bytes(data + b'junk')
+
+    downloader.download(url, dest, hashes)
+
+    assert api.ranges == [len(data) + 4]
+    assert dest.read_bytes() == data
+
+def test_hash_mismatch_leaves_nothing_behind(api, tmp_path):
+    url, _, _ = jar(api)
+    dest = tmp_path / 'a.jar'
+
+    with pytest.raises(downloader.HashMismatch):
+        downloader.download(url, dest, {"sha1": "0" * 40})
+
+    assert api.calls["/jar"] == downloader.ATTEMPTS
+    assert list(tmp_path.iterdir()) == []
+
+def test_existing_file_is_not_fetched_again(api, tmp_path):
+    url, hashes, data = jar(api)
+    dest = tmp_path / 'a.jar'
+    dest.write_bytes(data)
+
+    downloader.download(url, dest, hashes)
+    assert api.calls["/jar"] == 0
+
+def test_concurrent_requests_for_one_file_download_it_once(api, tmp_path):
+    url, hashes, data = jar(api)
+    dest = tmp_path / 'a.jar'
+
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(lambda _: downloader.download(url, dest, hashes), range(4)))
+
+    assert api.calls["/jar"] == 1
+    assert dest.read_bytes() == data
+
+def test_paused_throttle_waits_between_files(api, tmp_path):
+    url, hashes, data = jar(api)
+    throttle = downloader.Throttle()
+    throttle.pause()
+
+    with ThreadPoolExecutor(1) as pool:
+        future = pool.submit(downloader.download, url, tmp_path / 'a.jar', hashes, throttle=throttle)
+        with pytest.raises(TimeoutError): future.result(timeout=0.2)
+        assert api.calls["/jar"] == 0
+        throttle.resume()
+        future.result(timeout=5)
+
+    assert (tmp_path / 'a.jar').read_bytes() == data
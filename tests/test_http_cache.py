@@ -0,0 +1,69 @@
+import json, time
+import pytest, requests
+
+import stub, net, http_cache
+
+@pytest.fixture(scope="module")
+def etag_server():
+    srv = stub.StubServer(etags=True).start()
+    yield srv
+    srv.stop()
+
+@pytest.fixture
+def manifest(etag_server, mc_dir):
+    etag_server.reset()
+    url = etag_server.url + "/mc/game/version_manifest.json"
+    return url, http_cache.cache_key(url), *http_cache.rule_for(url)
+
+def age(key, seconds):
+    meta, _ = http_cache.load(key)
+    meta["stored_at"] = time.time() - seconds
+    (http_cache.get_cache_dir() / f"{key}.json").write_text(json.dumps(meta))
+
+def calls(srv):
+    return srv.calls["/mc/game/version_manifest.json"]
+
+def test_fresh_entries_skip_the_network(etag_server, manifest):
+    url, *_ = manifest
+    body = http_cache.get(url)
+
+    assert http_cache.get_json(url) == etag_server.catalog.manifest
+    assert http_cache.get(url) == body
+    assert calls(etag_server) == 1
+
+def test_expired_entries_revalidate_with_their_etag(etag_server, manifest):
+    url, key, ttl, swr = manifest
+    body = http_cache.get(url)
+    age(key, ttl + swr + 1)
+
+    assert http_cache.get(url) == body
+    assert calls(etag_server) == 2
+    assert etag_server.not_modified == 1
+    assert time.time() - http_cache.load(key)[0]["stored_at"] < 5
+
+def test_stale_entries_are_served_while_revalidating(etag_server, manifest):
+    url, key, ttl, _ = manifest
+    body = http_cache.get(url)
+    age(key, ttl + 1)
+
+    assert http_cache.get(url) == body
+    for _ in range(200):
+        if etag_server.not_modified: break
+        time.sleep(0.01)
+    assert etag_server.not_modified == 1
+    for _ in range(200):
+        if not http_cache._revalidating: break
+        time.sleep(0.01)
+    assert time.time() - http_cache.load(key)[0]["stored_at"] < 5
+
+def test_offline_falls_back_to_the_cache(etag_server, manifest, monkeypatch):
+    url, key, ttl, swr = manifest
+    body = http_cache.get(url)
+    age(key, ttl + swr + 1)
+
+    def offline(*args, **kwargs): raise requests.ConnectionError("offline")
+    monkeypatch.setattr(net, "get", offline)
+
+    assert http_cache.get(url) == body
+    with pytest.raises(requests.ConnectionError):
+        http_cache.get(etag_server.url + "/v2/search")
@@ -0,0 +1,61 @@
+import resolver, lockfile
+
+def version(pid, vid, *deps):
+    return {
+        "project_id": pid, "version_id": vid, "filename": f"{vid}.jar", "url": f"https://cdn/{vid}.jar",
+        "hash": f"sha1-{vid}", "sha512": f"sha512-{vid}", "size": 10,
+        "dependencies": [{"project_id": d, "dependency_type": "required"} for d in deps],
+    }
+
+def graph(wanted, available):
+    return resolver.resolve(wanted, "1.21", "fabric", lambda ids: {pid: available.get(pid) for pid in ids})
+
+AVAILABLE = {"a-slug": version("a", "a1", "lib"), "lib": version("lib", "lib1"), "b": version("b", "b1")}
+
+def test_build_records_the_closure():
+    lock = lockfile.build(graph(["a-slug", "b", "gone"], AVAILABLE), ["a-slug", "b", "gone"])
+
+    assert set(lock["mods"]) == {"a", "lib", "b"}
+    assert lock["mods"]["a"]["dependencies"] == [{"project_id": "lib", "dependency_type": "required"}]
+    assert lock["mods"]["a"]["url"] == "https://cdn/a1.jar" and lock["mods"]["a"]["sha512"] == "sha512-a1"
+    assert lock["mods"]["a"]["requested"] and not lock["mods"]["lib"]["requested"]
+    assert lock["aliases"] == {"a-slug": "a"}
+    assert lock["missing"] == ["gone"]
+
+def test_replaying_a_lock_resolves_the_same_graph():
+    wanted = ["a-slug", "b"]
+    lock = lockfile.build(graph(wanted, AVAILABLE), wanted)
+
+    def from_lock(ids):
+        found, rest = lockfile.split(lock, ids)
+        assert rest == []
+        return found
+
+    replayed = resolver.resolve(wanted, "1.21", "fabric", from_lock)
+    assert lockfile.same(lockfile.build(replayed, wanted), lock)
+
+def test_missing_projects_are_asked_again():
+    lock = lockfile.build(graph(["a-slug", "gone"], AVAILABLE), ["a-slug", "gone"])
+    found, rest = lockfile.split(lock, ["a-slug", "gone", "new"])
+
+    assert set(found) == {"a-slug"}
+    assert rest == ["gone", "new"]
+
+def test_diff_lists_added_removed_and_changed():
+    old = lockfile.build(graph(["a-slug", "b"], AVAILABLE), ["a-slug", "b"])
+    newer = {**AVAILABLE, "a-slug": version("a", "a2", "lib"), "c": version("c", "c1")}
+    new = lockfile.build(graph(["a-slug", "c"], newer), ["a-slug", "c"])
+
+    assert lockfile.diff(old, new) == {
+        "added":    [("c", "c1.jar")],
+        "removed":  [("b", "b1.jar")],
+        "changed":  [("a", "a1.jar", "a2.jar")],
+    }
+
+def test_write_only_saves_changes(mc_dir):
+    lock = lockfile.build(graph(["b"], AVAILABLE), ["b"])
+
+    assert lockfile.write(lock)
+    saved = lockfile.load("1.21", "fabric")
+    assert lockfile.same(saved, lock)
+    assert not lockfile.write(lockfile.build(graph(["b"], AVAILABLE), ["b"]), saved)
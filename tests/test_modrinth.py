@@ -0,0 +1,57 @@
+import pytest
+
+import stub, modrinth
+
+def newest(catalog, pid, mc_version, loader):
+    matching = [v for v in catalog.versions.values() if v["project_id"] == pid and loader in v["loaders"] and mc_version in v["game_versions"]]
+    return max(matching, key=lambda v: v["date_published"])["id"] if matching else None
+
+IDS = [f"mod{i:04d}" for i in range(30)]
+
+def test_resolves_latest_versions_in_batches(api):
+    results = modrinth.get_latest_versions(IDS, "1.21", "fabric")
+
+    for pid in IDS:
+        expected = newest(api.catalog, pid, "1.21", "fabric")
+        assert (results[pid] and results[pid]["version_id"]) == expected
+    assert api.calls["/v2/projects"] == 1
+    assert api.calls["/v2/versions"] == 3
+    assert api.calls["/v2/project/{id}/version"] == 0
+
+def test_tail_without_a_match_asks_per_project(api):
+    # 1.20.1 builds are the oldest, so they're never in the version tail.
+    results = modrinth.get_latest_versions(IDS, "1.20.1", "fabric")
+
+    for pid in IDS:
+        expected = newest(api.catalog, pid, "1.20.1", "fabric")
+        assert (results[pid] and results[pid]["version_id"]) == expected
+    assert api.calls["/v2/project/{id}/version"] == sum(1 for pid in IDS if results[pid])
+
+def test_known_hashes_resolve_through_update_endpoint(api):
+    old = {pid: api.catalog.versions[f"{pid}v00"]["files"][0]["hashes"]["sha1"] for pid in IDS[:5]}
+    results = modrinth.get_latest_versions(IDS[:5], "1.21", "fabric", known_hashes=old)
+
+    for pid in IDS[:5]:
+        expected = newest(api.catalog, pid, "1.21", "fabric")
+        assert (results[pid] and results[pid]["version_id"]) == expected
+    assert api.calls["/v2/version_files/update"] == 1
+    assert api.calls["/v2/projects"] == (1 if None in results.values() else 0)
+
+def test_unordered_version_lists_are_not_trusted(mc_dir, monkeypatch):
+    # Newest builds first, then the rest oldest-first: the tail holds a 1.21 build, just not the newest.
+    catalog = stub.Catalog.generate(projects=10, libraries=2)
+    for p in catalog.projects.values(): p["versions"] = p["versions"][:-4:-1] + p["versions"][:-3]
+    srv = stub.StubServer(catalog).start()
+    catalog.rebase(srv.url)
+    monkeypatch.setattr(modrinth, "BASE_URL", srv.url + "/v2")
+    try:
+        ids = list(catalog.projects)
+        results = modrinth.get_latest_versions(ids, "1.21", "fabric")
+        for pid in ids:
+            expected = newest(catalog, pid, "1.21", "fabric")
+            assert (results[pid] and results[pid]["version_id"]) == expected
+    finally:
+        srv.stop()
+
+def test_unknown_projects_resolve_to_none(api):
+    assert modrinth.get_latest_versions(["nope"], "1.21", "fabric") == {"nope": None}
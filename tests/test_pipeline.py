@@ -0,0 +1,108 @@
+from concurrent.futures import ThreadPoolExecutor
+import time, threading
+import pytest
+
+import pipeline
+from pipeline import Task, Pipeline, DONE, FAILED, CANCELLED
+
+def test_stages_run_after_their_dependencies():
+    order = []
+    def stage(name):
+        def fn():
+            order.append(name)
+            return name
+        return fn
+
+    p = Pipeline([
+        Task("c", stage("c"), deps=("a", "b")),
+        Task("a", stage("a")),
+        Task("b", stage("b"), deps=("a",)),
+    ])
+
+    assert p.run() == {"c": "c", "a": "a", "b": "b"}
+    assert order == ["a", "b", "c"]
+    assert {t.status for t in p.tasks.values()} == {DONE}
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError):
+        Pipeline([Task("a", lambda: None, deps=("nope",))])
+
+def test_optional_failure_does_not_stop_the_pipeline():
+    def broken(): raise OSError("offline")
+    p = Pipeline([Task("icons", broken, optional=True), Task("launch", lambda: 1, deps=("icons",))])
+
+    assert p.run()["launch"] == 1
+    assert p.tasks["icons"].status == FAILED
+    assert isinstance(p.tasks["icons"].error, OSError)
+
+def test_required_failure_cancels_the_rest_quickly():
+    started = threading.Event()
+    stopped = []
+
+    def long_download():
+        started.set()
+        # Work handed to another executor still sees the pipeline's cancel flag.
+        with ThreadPoolExecutor(1) as pool:
+            def chunks():
+                for _ in range(500):
+                    time.sleep(0.01)
+                    pipeline.check_cancelled()
+            try: pipeline.submit(pool, chunks).result()
+            except pipeline.Cancelled:
+                stopped.append(True)
+                raise
+
+    def broken():
+        started.wait()
+        raise RuntimeError("java missing")
+
+    p = Pipeline([
+        Task("mods", long_download),
+        Task("java", broken),
+        Task("launch", lambda: None, deps=("mods", "java")),
+    ])
+
+    start = time.perf_counter()
+    with pytest.raises(RuntimeError, match="java missing"):
+        p.run()
+
+    assert time.perf_counter() - start < 1
+    assert p.tasks["java"].status == FAILED
+    assert p.tasks["launch"].status == CANCELLED
+    assert p.tasks["mods"].status == CANCELLED
+    assert stopped
+
+def test_failure_waits_for_stages_that_ignore_the_flag():
+    finished = []
+    def libraries():
+        time.sleep(0.3)
+        finished.append(True)
+
+    def broken(): raise RuntimeError("java missing")
+
+    p = Pipeline([Task("libraries", libraries), Task("java", broken)])
+    with pytest.raises(RuntimeError):
+        p.run()
+
+    # Nothing is left writing to the game directory once run() gives up.
+    assert finished
+    assert p.tasks["libraries"].status == DONE
+
+def test_queued_stages_never_start_after_a_failure():
+    started = []
+    def broken(): raise RuntimeError("boom")
+
+    p = Pipeline([Task("a", broken), Task("b", lambda: started.append("b"))], max_workers=1)
+    with pytest.raises(RuntimeError):
+        p.run()
+
+    assert started == []
+    assert p.tasks["b"].status == CANCELLED
+
+def test_status_changes_are_reported():
+    seen = []
+    Pipeline([Task("a", lambda: None)], on_status=lambda name, status: seen.append((name, status))).run()
+    assert seen == [("a", "running"), ("a", "done")]
+
+def test_check_cancelled_is_a_no_op_outside_a_pipeline():
+    pipeline.check_cancelled()
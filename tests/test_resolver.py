@@ -0,0 +1,61 @@
+import resolver
+
+def version(pid, *deps, **kinds):
+    # deps are required project IDs; kinds maps a dependency type to a list of project IDs.
+    dependencies = [{"project_id": d, "dependency_type": "required"} for d in deps]
+    for kind, ids in kinds.items():
+        dependencies += [{"project_id": d, "dependency_type": kind} for d in ids]
+    return {"project_id": pid, "version_id": f"{pid}-v1", "filename": f"{pid}.jar", "hash": pid, "dependencies": dependencies}
+
+def resolve(wanted, available, **kwargs):
+    batches = []
+    def resolve_batch(ids):
+        batches.append(sorted(ids))
+        return {pid: available.get(pid) for pid in ids}
+    graph = resolver.resolve(wanted, "1.21", "fabric", resolve_batch, **kwargs)
+    return graph, batches
+
+def test_dependencies_resolve_in_waves():
+    graph, batches = resolve(["a"], {"a": version("a", "b"), "b": version("b", "c"), "c": version("c")})
+
+    assert set(graph.nodes) == {"a", "b", "c"}
+    assert batches == [["a"], ["b"], ["c"]]
+    assert graph.edges == {"a": {"b"}, "b": {"c"}, "c": set()}
+    assert graph.nodes["a"].requested and not graph.nodes["c"].requested
+    assert graph.nodes["c"].required_by == {"b"}
+
+def test_missing_dependencies_name_who_wanted_them():
+    graph, _ = resolve(["a", "gone"], {"a": version("a", "x")})
+
+    assert graph.missing == {"x": {"a"}, "gone": set()}
+    assert graph.edges["a"] == set()
+
+def test_optional_dependencies_are_reported_not_installed():
+    graph, _ = resolve(["a", "b"], {"a": version("a", optional=["o", "b"]), "b": version("b"), "o": version("o")})
+
+    assert set(graph.nodes) == {"a", "b"}
+    assert graph.optional == {"o": {"a"}}
+
+def test_cycles_are_detected():
+    graph, _ = resolve(["a"], {"a": version("a", "b"), "b": version("b", "c"), "c": version("c", "a")})
+
+    assert set(graph.nodes) == {"a", "b", "c"}
+    assert len(graph.cycles) == 1 and set(graph.cycles[0]) == {"a", "b", "c"}
+
+def test_incompatible_pairs_are_conflicts():
+    graph, _ = resolve(["a", "b"], {"a": version("a", incompatible=["b"]), "b": version("b")})
+    assert graph.conflicts == [("a", "b")]
+
+def test_slugs_map_to_their_project():
+    graph, _ = resolve(["a-slug"], {"a-slug": version("a")})
+
+    assert set(graph.nodes) == {"a"}
+    assert graph.aliases == {"a-slug": "a"}
+
+def test_dependencies_pinned_by_version_id_are_looked_up():
+    a = version("a")
+    a["dependencies"] = [{"version_id": "b-v1", "dependency_type": "required"}]
+    graph, _ = resolve(["a"], {"a": a, "b": version("b")}, lookup_versions=lambda ids: [{"id": "b-v1", "project_id": "b"} for i in ids if i == "b-v1"])
+
+    assert set(graph.nodes) == {"a", "b"}
+    assert graph.edges["a"] == {"b"}
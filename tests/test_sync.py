@@ -0,0 +1,47 @@
+import hashlib
+
+import sync
+
+def blob(tmp_path, name, data: bytes):
+    f = tmp_path / 'store' / name
+    f.parent.mkdir(exist_ok=True)
+    f.write_bytes(data)
+    return f, hashlib.sha1(data).hexdigest()
+
+def test_sync_adds_keeps_and_removes(tmp_path):
+    dest = tmp_path / 'mods'
+    a, b = blob(tmp_path, 'a', b'a' * 100), blob(tmp_path, 'b', b'b' * 100)
+
+    report = sync.sync_dir({"a.jar": a, "b.jar": b}, dest)
+    assert sorted(report.added) == ["a.jar", "b.jar"]
+    assert (dest / 'a.jar').read_bytes() == b'a' * 100
+
+    (dest / 'stray.jar').write_bytes(b'x')
+    (dest / 'notes.txt').write_text('not a jar')
+    report = sync.sync_dir({"a.jar": a}, dest)
+
+    assert report.kept == ["a.jar"]
+    assert sorted(report.removed) == ["b.jar", "stray.jar"]
+    assert sorted(f.name for f in dest.iterdir()) == [sync.STATE_FILE, "a.jar", "notes.txt"]
+
+def test_sync_replaces_changed_files(tmp_path):
+    dest = tmp_path / 'mods'
+    dest.mkdir()
+    (dest / 'a.jar').write_bytes(b'old' * 50)
+    new = blob(tmp_path, 'a', b'new' * 50)
+
+    report = sync.sync_dir({"a.jar": new}, dest)
+
+    assert report.added == ["a.jar"]
+    assert (dest / 'a.jar').read_bytes() == b'new' * 50
+
+def test_unchanged_sync_is_a_no_op(tmp_path):
+    dest = tmp_path / 'mods'
+    files = {f"{n}.jar": blob(tmp_path, n, n.encode() * 64) for n in "abc"}
+    sync.sync_dir(files, dest)
+    state = (dest / sync.STATE_FILE).stat().st_mtime_ns
+
+    report = sync.sync_dir(files, dest)
+
+    assert sorted(report.kept) == ["a.jar", "b.jar", "c.jar"] and not report.added and not report.removed
+    assert (dest / sync.STATE_FILE).stat().st_mtime_ns == state